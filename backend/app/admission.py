@@ -0,0 +1,180 @@
+"""
+Admission control for routes that call the Riot API
+Rejects requests early when the rate-limit budget cannot serve them in time
+"""
+from typing import Iterable, List, Optional
+import math
+
+from .api import RiotApiClient, AUTO_REGION
+from .services import MatchService
+from .quota import ConsumerQuota
+
+
+class AdmissionRejectedException(Exception):
+    """Raised when a request cannot be served within the admission deadline"""
+    def __init__(self, upstream_calls: int, retry_after: float):
+        self.upstream_calls = upstream_calls
+        self.retry_after = max(1, math.ceil(retry_after))
+        super().__init__(
+            f"Riot API budget exhausted: {upstream_calls} upstream calls needed. "
+            f"Retry in {self.retry_after}s."
+        )
+
+
+class AdmissionTooLargeException(Exception):
+    """Raised when a request needs more upstream calls than could ever be admitted"""
+    def __init__(self, upstream_calls: int, max_calls: int):
+        self.upstream_calls = upstream_calls
+        self.max_calls = max_calls
+        super().__init__(
+            f"Request needs {upstream_calls} upstream calls, more than the {max_calls} "
+            f"that can be admitted at once. Request fewer items."
+        )
+
+
+class AdmissionController:
+    """
+    Estimates the upstream calls of each request from the cache state and
+    compares them with the rate-limit headroom and the limiter queue
+    """
+
+    # Worst case for the rankings of a live game we know nothing about yet
+    LIVE_GAME_PARTICIPANTS = 10
+
+    def __init__(
+        self,
+        riot_client: RiotApiClient,
+        match_service: MatchService,
+        max_wait: float = 5.0,
+        consumer_quota: Optional[ConsumerQuota] = None
+    ):
+        self.riot_client = riot_client
+        self.match_service = match_service
+        # Longest projected wait for the rate limiter before a request is rejected
+        self.max_wait = max_wait
+        # Fair share of the budget per consumer, None to share it first come first served
+        self.consumer_quota = consumer_quota
+
+    def projected_wait(self, calls: int) -> float:
+        """
+        Returns the projected number of seconds before the given calls have all been sent
+        """
+        queued = self.riot_client.get_queued_requests()
+        spacing = self.riot_client.min_request_interval.total_seconds()
+        return (queued + calls) * spacing + self.riot_client.seconds_until_headroom(queued + calls)
+
+    def max_calls(self, progressive: bool = False, consumer: Optional[str] = None) -> int:
+        """
+        Returns the most upstream calls a single request can be admitted with, even with an idle budget
+        """
+        max_calls = self.riot_client.rate_limit_max_requests
+        if not progressive:
+            spacing = self.riot_client.min_request_interval.total_seconds()
+            if spacing > 0:
+                max_calls = min(max_calls, int(self.max_wait / spacing))
+        if self.consumer_quota is not None and consumer is not None:
+            max_calls = min(max_calls, self.consumer_quota.max_allowance())
+        return max_calls
+
+    def admit(self, calls: int, consumer: Optional[str] = None, progressive: bool = False) -> None:
+        """
+        Lets the request through or raises AdmissionRejectedException
+
+        Requests served entirely from cache (0 calls) are always admitted.
+        Progressive requests (results streamed as they arrive) only need their
+        first call to start in time. Requests that could never fit raise
+        AdmissionTooLargeException instead of asking the caller to retry.
+        Admitted calls are charged to the consumer's share, which raises
+        QuotaExceededException once it is used up.
+        """
+        if calls > 0:
+            max_calls = self.max_calls(progressive, consumer)
+            if calls > max_calls:
+                raise AdmissionTooLargeException(calls, max_calls)
+            wait = self.projected_wait(1 if progressive else calls)
+            if wait > self.max_wait:
+                raise AdmissionRejectedException(calls, wait - self.max_wait)
+        if self.consumer_quota is not None and consumer is not None:
+            self.consumer_quota.charge(consumer, calls)
+
+    # Upstream call estimates, one per route family
+
+    def _cached_account_puuid(self, summoner_name: str, tag_line: str) -> Optional[str]:
+        account = self.riot_client.account_cache.get((summoner_name.strip().lower(), tag_line.strip().lower()))
+        if account is not None:
+            return account.puuid
+        known = self.riot_client.riot_id_index.get(
+            summoner_name, tag_line, max_age=self.riot_client.riot_id_index_max_age
+        )
+        return known["puuid"] if known is not None else None
+
+    def _known_missing_account(self, summoner_name: str, tag_line: str) -> bool:
+        return (summoner_name.strip().lower(), tag_line.strip().lower()) in self.riot_client.missing_account_cache
+
+    def estimate_account(self, summoner_name: str, tag_line: str) -> int:
+        if self._known_missing_account(summoner_name, tag_line):
+            return 0
+        return 0 if self._cached_account_puuid(summoner_name, tag_line) else 1
+
+    def estimate_player(self, summoner_name: str, tag_line: str, region: str) -> int:
+        region = region.upper()
+        if self._known_missing_account(summoner_name, tag_line):
+            return 0
+        puuid = self._cached_account_puuid(summoner_name, tag_line)
+        if puuid is None:
+            return 3 if region != AUTO_REGION else 4
+
+        calls = 0
+        if region == AUTO_REGION:
+            region = self.riot_client.player_region_cache.get(puuid)
+            if region is None:
+                return 3
+        calls += self.estimate_summoner(puuid, region)
+        calls += self.estimate_league_entries(puuid, region)
+        return calls
+
+    def estimate_players(self, lookups: Iterable) -> int:
+        unique = {
+            (lookup.gameName.strip().lower(), lookup.tagLine.strip().lower(), lookup.region.upper()): lookup
+            for lookup in lookups
+        }
+        return sum(
+            self.estimate_player(lookup.gameName, lookup.tagLine, lookup.region)
+            for lookup in unique.values()
+        )
+
+    def estimate_summoner(self, puuid: str, region: str) -> int:
+        return 0 if (puuid, region.upper()) in self.riot_client.summoner_cache else 1
+
+    def estimate_league_entries(self, puuid: str, region: str) -> int:
+        return 0 if (puuid.strip(), region.upper()) in self.riot_client.league_cache else 1
+
+    def estimate_live_game(self, summoner_name: str, tag_line: str, region: str) -> int:
+        region = region.upper()
+        if self._known_missing_account(summoner_name, tag_line):
+            return 0
+        puuid = self._cached_account_puuid(summoner_name, tag_line)
+        if puuid is None:
+            return 2 + self.LIVE_GAME_PARTICIPANTS
+        if region == AUTO_REGION:
+            region = self.riot_client.player_region_cache.get(puuid)
+            if region is None:
+                return 2 + self.LIVE_GAME_PARTICIPANTS
+
+        game = self.riot_client.active_game_cache.get((puuid, region))
+        if game is None:
+            return 1 + self.LIVE_GAME_PARTICIPANTS
+        return sum(
+            self.estimate_league_entries(participant["puuid"], region)
+            for participant in game.get("participants", [])
+            if participant.get("puuid")
+        )
+
+    def estimate_match_history(self, puuid: str, region: str, start: int, count: int) -> int:
+        return 0 if (puuid, region.upper(), start, count) in self.riot_client.match_history_cache else 1
+
+    def estimate_match_details(self, match_ids: List[str]) -> int:
+        return sum(1 for match_id in match_ids if not self.match_service.has_local_match_details(match_id.strip()))
+
+    def estimate_match_timeline(self, match_id: str) -> int:
+        return 0 if match_id.strip() in self.riot_client.timeline_cache else 1
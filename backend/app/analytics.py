@@ -0,0 +1,182 @@
+"""
+Champion matchup and synergy analytics
+Keeps dense champion x champion game/win matrices updated as matches are stored
+"""
+from typing import Any, Dict, List, Optional, Tuple
+import threading
+
+import numpy as np
+
+
+MATCHUP = "matchup"
+SYNERGY = "synergy"
+
+# Participants without a lane (ARAM, Arena, ...) are grouped under this role
+NO_ROLE = "NONE"
+
+
+def get_patch(game_version: str) -> str:
+    """Returns the patch of a game version (e.g., "14.24.640.2156" -> "14.24")"""
+    return ".".join(game_version.split(".")[:2])
+
+
+class _PairTable:
+    """Game and win counters of one (patch, queue, role) slice"""
+
+    def __init__(self, capacity: int):
+        self.games = np.zeros(capacity, dtype=np.int32)
+        self.wins = np.zeros(capacity, dtype=np.int32)
+        self.pair_games = {kind: np.zeros((capacity, capacity), dtype=np.int32) for kind in (MATCHUP, SYNERGY)}
+        self.pair_wins = {kind: np.zeros((capacity, capacity), dtype=np.int32) for kind in (MATCHUP, SYNERGY)}
+
+    def grow(self, capacity: int) -> None:
+        size = len(self.games)
+        self.games = np.pad(self.games, (0, capacity - size))
+        self.wins = np.pad(self.wins, (0, capacity - size))
+        for kind in (MATCHUP, SYNERGY):
+            self.pair_games[kind] = np.pad(self.pair_games[kind], ((0, capacity - size), (0, capacity - size)))
+            self.pair_wins[kind] = np.pad(self.pair_wins[kind], ((0, capacity - size), (0, capacity - size)))
+
+
+class ChampionStats:
+    """
+    Champion vs champion (same lane) and champion with champion (same team) statistics
+
+    Champion IDs are mapped to compact matrix indices on first sight, so matrices
+    only grow with the number of champions actually seen.
+    """
+
+    def __init__(self, initial_capacity: int = 192):
+        self._capacity = initial_capacity
+        self._index: Dict[int, int] = {}
+        self._champion_ids: List[int] = []
+        self._tables: Dict[Tuple[str, int, str], _PairTable] = {}
+        self._lock = threading.Lock()
+
+    def _champion_slot(self, champion_id: int) -> int:
+        slot = self._index.get(champion_id)
+        if slot is None:
+            slot = len(self._champion_ids)
+            self._index[champion_id] = slot
+            self._champion_ids.append(champion_id)
+            if slot >= self._capacity:
+                self._capacity *= 2
+                for table in self._tables.values():
+                    table.grow(self._capacity)
+        return slot
+
+    def _table(self, key: Tuple[str, int, str]) -> _PairTable:
+        table = self._tables.get(key)
+        if table is None:
+            table = _PairTable(self._capacity)
+            self._tables[key] = table
+        return table
+
+    def ingest(self, match: Dict[str, Any]) -> None:
+        """
+        Adds one match to the matrices (each match must be ingested only once)
+
+        Args:
+            match: Complete match data as returned by match-v5
+        """
+        info = match.get("info", {})
+        participants = info.get("participants", [])
+        if not participants:
+            return
+
+        patch = get_patch(info.get("gameVersion", ""))
+        queue = info.get("queueId", 0)
+
+        with self._lock:
+            slots = np.array([self._champion_slot(p["championId"]) for p in participants])
+            teams = np.array([p["teamId"] for p in participants])
+            wins = np.array([bool(p["win"]) for p in participants])
+            roles = np.array([p.get("teamPosition") or NO_ROLE for p in participants])
+
+            same_team = teams[:, None] == teams[None, :]
+            not_self = ~np.eye(len(participants), dtype=bool)
+            pair_masks = {
+                MATCHUP: ~same_team & (roles[:, None] == roles[None, :]) & (roles[:, None] != NO_ROLE),
+                SYNERGY: same_team & not_self,
+            }
+
+            for role in np.unique(roles):
+                table = self._table((patch, queue, str(role)))
+                in_role = roles == role
+                np.add.at(table.games, slots[in_role], 1)
+                np.add.at(table.wins, slots[in_role & wins], 1)
+
+                for kind, mask in pair_masks.items():
+                    rows, cols = np.nonzero(mask & in_role[:, None])
+                    np.add.at(table.pair_games[kind], (slots[rows], slots[cols]), 1)
+                    won = wins[rows]
+                    np.add.at(table.pair_wins[kind], (slots[rows[won]], slots[cols[won]]), 1)
+
+    def top_pairs(
+        self,
+        champion_id: int,
+        kind: str = MATCHUP,
+        patch: Optional[str] = None,
+        queue: Optional[int] = None,
+        role: Optional[str] = None,
+        limit: int = 10,
+        min_games: int = 1,
+        ascending: bool = False,
+    ) -> Dict[str, Any]:
+        """
+        Returns the best (or worst) matchups or duos of a champion with their sample sizes
+
+        Args:
+            champion_id: Champion ID
+            kind: "matchup" (same lane, opposite team) or "synergy" (same team)
+            patch: Patch filter (e.g., "14.24"), None for every patch
+            queue: Queue ID filter (e.g., 420), None for every queue
+            role: Role filter (e.g., "MIDDLE"), None for every role
+            limit: Number of champions to return
+            min_games: Minimum sample size of a pair
+            ascending: Return the lowest win rates first
+
+        Returns:
+            Dict: Champion sample size and the sorted list of pairs
+        """
+        with self._lock:
+            slot = self._index.get(champion_id)
+            games = 0
+            wins = 0
+            pair_games = np.zeros(self._capacity, dtype=np.int64)
+            pair_wins = np.zeros(self._capacity, dtype=np.int64)
+
+            if slot is not None:
+                for (table_patch, table_queue, table_role), table in self._tables.items():
+                    if patch is not None and table_patch != patch:
+                        continue
+                    if queue is not None and table_queue != queue:
+                        continue
+                    if role is not None and table_role != role:
+                        continue
+                    games += int(table.games[slot])
+                    wins += int(table.wins[slot])
+                    pair_games += table.pair_games[kind][slot]
+                    pair_wins += table.pair_wins[kind][slot]
+
+            champion_ids = np.array(self._champion_ids + [0] * (self._capacity - len(self._champion_ids)))
+
+        candidates = np.nonzero(pair_games >= max(min_games, 1))[0]
+        win_rates = pair_wins[candidates] / pair_games[candidates]
+        # Sort by win rate, then by sample size for ties
+        order = np.lexsort((-pair_games[candidates], win_rates if ascending else -win_rates))[:limit]
+
+        return {
+            "games": games,
+            "wins": wins,
+            "winRate": round(wins / games, 4) if games else None,
+            "pairs": [
+                {
+                    "championId": int(champion_ids[candidates[i]]),
+                    "games": int(pair_games[candidates[i]]),
+                    "wins": int(pair_wins[candidates[i]]),
+                    "winRate": round(float(win_rates[i]), 4),
+                }
+                for i in order
+            ],
+        }
@@ -2,22 +2,27 @@ import os
 import requests
 import asyncio
 from typing import Optional, Dict, Any, List
-from dotenv import load_dotenv
 from datetime import datetime, timedelta
+from collections import deque
 import logging
 import time
 
 from .models import RiotAccount, SummonerInfo, LeagueEntry, ApiResponse
+from .cache import TTLCache, save_snapshot, load_snapshot
+from .timeline import summarize_timeline
+from .search import RiotIdIndex
 from .exceptions import (
     RiotApiException, 
     AccountNotFoundException, 
     RateLimitException, 
     ApiKeyException,
-    ServiceUnavailableException
+    ServiceUnavailableException,
+    ActiveGameNotFoundException,
+    PlayerNotFoundException
 )
 
-# Load environment variables from .env file
-load_dotenv()
+# Pseudo-region letting the API find the player's platform by itself
+AUTO_REGION = "AUTO"
 
 # Logging configuration
 logging.basicConfig(level=logging.INFO)
@@ -69,6 +74,15 @@ class RiotApiClient:
             "VN": "https://sea.api.riotgames.com"
         }
         
+        # Platform IDs as returned by Riot (e.g. "euw1") mapped to our region codes
+        self.platform_regions = {
+            url.split("//")[1].split(".")[0]: region
+            for region, url in self.platform_endpoints.items()
+        }
+        
+        # Routing cluster used for account lookups when the region is unknown
+        self.default_routing_region: str = "EUW"
+        
         # API key validation
         if not self.api_key:
             print("⚠️  WARNING: RIOT_API_KEY is not defined. API calls will fail.")
@@ -80,9 +94,53 @@ class RiotApiClient:
             "Content-Type": "application/json"
         }
         
+        # Pooled keep-alive connections shared by every request
+        self.session = requests.Session()
+        self._in_flight: int = 0
+        
         # Basic rate limiting
         self.last_request_time: Optional[datetime] = None
         self.min_request_interval: timedelta = timedelta(milliseconds=100)  # 10 req/sec max
+        self._rate_limit_lock = asyncio.Lock()
+        self._queued_requests: int = 0
+        
+        # Longer budget window (development keys allow 100 requests every 2 minutes)
+        self.rate_limit_window: float = float(os.getenv("RIOT_RATE_LIMIT_WINDOW", "120"))
+        self.rate_limit_max_requests: int = int(os.getenv("RIOT_RATE_LIMIT_MAX_REQUESTS", "100"))
+        self._request_timestamps: deque = deque()
+        
+        # Finished matches never change, so their details can be cached for a long time
+        self.match_cache = TTLCache(max_size=2000, ttl=24 * 3600)
+        # Player lookups shared by every route (account data is global to all regions)
+        self.account_cache = TTLCache(max_size=5000, ttl=3600)
+        # Riot IDs confirmed missing (404), so typos do not reach the API again
+        self.missing_account_cache = TTLCache(max_size=10000, ttl=600)
+        self.summoner_cache = TTLCache(max_size=5000, ttl=600)
+        self.league_cache = TTLCache(max_size=5000, ttl=300)
+        # Live games are shared by all ten participants, keep them just long enough to be reused
+        self.active_game_cache = TTLCache(max_size=1000, ttl=30)
+        # Players very rarely transfer, so their platform can be remembered for a long time
+        self.player_region_cache = TTLCache(max_size=20000, ttl=7 * 24 * 3600)
+        # Only the derived timeline series are cached, never the raw (megabyte-sized) timelines
+        self.timeline_cache = TTLCache(max_size=500, ttl=24 * 3600)
+        # Match ID lists change after every game, keep them only briefly
+        self.match_history_cache = TTLCache(max_size=500, ttl=120)
+        
+        # Every Riot ID seen in account lookups, live games and matches
+        self.riot_id_index = RiotIdIndex()
+        # Riot IDs seen longer ago than this may have been changed since, they are only suggested
+        self.riot_id_index_max_age: float = 24 * 3600
+        
+        # Caches saved across restarts (match details are already kept by the match store)
+        self.persistent_caches: Dict[str, TTLCache] = {
+            "account": self.account_cache,
+            "missing_account": self.missing_account_cache,
+            "summoner": self.summoner_cache,
+            "league": self.league_cache,
+            "player_region": self.player_region_cache,
+            "timeline": self.timeline_cache,
+            "match_history": self.match_history_cache,
+        }
     
 
 
@@ -111,16 +169,157 @@ class RiotApiClient:
 
 
 
-    def _rate_limit_wait(self) -> None:
-        """Applies delay to respect rate limits"""
-        if self.last_request_time:
-            elapsed = datetime.now() - self.last_request_time
-            if elapsed < self.min_request_interval:
-                sleep_time = (self.min_request_interval - elapsed).total_seconds()
-                logger.debug(f"Rate limiting: waiting {sleep_time:.3f}s")
-                time.sleep(sleep_time)
-        
-        self.last_request_time = datetime.now()
+    async def _get(self, url: str, params: Optional[Dict[str, Any]] = None) -> requests.Response:
+        """Sends a GET request on the shared session without blocking the event loop"""
+        self._in_flight += 1
+        try:
+            return await asyncio.to_thread(self.session.get, url, headers=self.headers, params=params, timeout=10)
+        finally:
+            self._in_flight -= 1
+    
+    async def warm_up(self, regions: List[str]) -> None:
+        """
+        Resolves DNS and opens pooled connections to the endpoints of the given regions
+        
+        Args:
+            regions: Region codes whose platform and regional hosts should be warmed
+        """
+        base_urls = set()
+        for region in regions:
+            if region in self.platform_endpoints:
+                base_urls.add(self.platform_endpoints[region])
+                base_urls.add(self.regional_endpoints[region])
+            else:
+                logger.warning(f"Skipping warm-up of unsupported region: {region}")
+        
+        async def warm(base_url: str) -> None:
+            try:
+                # Unauthenticated HEAD: opens the TLS connection without using the rate budget
+                await asyncio.to_thread(self.session.head, base_url, timeout=5)
+            except requests.exceptions.RequestException as e:
+                logger.warning(f"Warm-up of {base_url} failed: {str(e)}")
+        
+        await asyncio.gather(*(warm(base_url) for base_url in base_urls))
+        logger.info(f"Warmed up connections to {len(base_urls)} Riot API hosts")
+    
+    async def save_caches(self, path: str) -> None:
+        """
+        Snapshots the persistent caches to a local file
+        
+        Entries are copied on the event loop (caches are not thread-safe),
+        then serialized and written in a worker thread.
+        
+        Args:
+            path: Snapshot file
+        """
+        snapshots = {name: cache.snapshot() for name, cache in self.persistent_caches.items()}
+        try:
+            await asyncio.to_thread(save_snapshot, snapshots, path)
+        except OSError as e:
+            logger.warning(f"Could not save cache snapshot to {path}: {str(e)}")
+            return
+        logger.info(f"Saved {sum(len(entries) for entries in snapshots.values())} cache entries to {path}")
+    
+    async def restore_caches(self, path: str) -> None:
+        """
+        Reloads the persistent caches from a snapshot, with TTLs shortened by its age
+        
+        Args:
+            path: Snapshot file written by save_caches
+        """
+        snapshots, age = await asyncio.to_thread(load_snapshot, path)
+        restored = sum(
+            cache.restore(snapshots.get(name, []), age)
+            for name, cache in self.persistent_caches.items()
+        )
+        if snapshots:
+            logger.info(f"Restored {restored} cache entries from a {age:.0f}s old snapshot")
+    
+    async def save_caches_periodically(self, path: str, interval: float) -> None:
+        """
+        Snapshots the persistent caches every interval seconds
+        """
+        while True:
+            await asyncio.sleep(interval)
+            await self.save_caches(path)
+    
+    async def close(self, drain_timeout: float = 10.0) -> None:
+        """
+        Waits for in-flight requests to finish, then flushes caches and closes connections
+        
+        Args:
+            drain_timeout: Maximum number of seconds to wait for in-flight requests
+        """
+        deadline = time.monotonic() + drain_timeout
+        while self._in_flight and time.monotonic() < deadline:
+            await asyncio.sleep(0.05)
+        if self._in_flight:
+            logger.warning(f"Closing Riot API client with {self._in_flight} requests still in flight")
+        
+        for cache in (
+            self.account_cache,
+            self.missing_account_cache,
+            self.summoner_cache,
+            self.league_cache,
+            self.player_region_cache,
+            self.active_game_cache,
+            self.match_history_cache,
+            self.match_cache,
+            self.timeline_cache,
+        ):
+            cache.clear()
+        self.session.close()
+    
+    async def _rate_limit_wait(self) -> None:
+        """Applies delay to respect rate limits (shared by concurrent requests)"""
+        self._queued_requests += 1
+        try:
+            async with self._rate_limit_lock:
+                # Budget window exhausted: wait for the oldest request to leave it
+                window_wait = self.seconds_until_headroom(1)
+                if window_wait > 0:
+                    logger.warning(f"Rate limit budget exhausted: waiting {window_wait:.1f}s")
+                    await asyncio.sleep(window_wait)
+                
+                if self.last_request_time:
+                    elapsed = datetime.now() - self.last_request_time
+                    if elapsed < self.min_request_interval:
+                        sleep_time = (self.min_request_interval - elapsed).total_seconds()
+                        logger.debug(f"Rate limiting: waiting {sleep_time:.3f}s")
+                        await asyncio.sleep(sleep_time)
+                
+                self.last_request_time = datetime.now()
+                self._request_timestamps.append(time.monotonic())
+        finally:
+            self._queued_requests -= 1
+    
+    def get_rate_limit_headroom(self) -> int:
+        """
+        Returns how many requests can still be sent in the current budget window
+        """
+        cutoff = time.monotonic() - self.rate_limit_window
+        while self._request_timestamps and self._request_timestamps[0] <= cutoff:
+            self._request_timestamps.popleft()
+        
+        return max(0, self.rate_limit_max_requests - len(self._request_timestamps))
+    
+    def seconds_until_headroom(self, calls: int) -> float:
+        """
+        Returns how long until the budget window has room for the given number of calls
+        """
+        missing = calls - self.get_rate_limit_headroom()
+        if missing <= 0:
+            return 0.0
+        if missing > len(self._request_timestamps):
+            # More calls than a whole window allows: they need several windows
+            return self.rate_limit_window * (missing / self.rate_limit_max_requests + 1)
+        
+        expires_at = self._request_timestamps[missing - 1] + self.rate_limit_window
+        return max(0.0, expires_at - time.monotonic())
+    
+    def get_queued_requests(self) -> int:
+        """Returns how many requests are waiting for (or holding) the rate limiter"""
+        return self._queued_requests
 
 
 
@@ -136,7 +335,7 @@ class RiotApiClient:
         Args:
             summoner_name: Summoner name (e.g., "Faker")
             tag_line: Tag line (e.g., "T1")
-            region: Region code (e.g., "EUW", "NA", "KR")
+            region: Region code (e.g., "EUW", "NA", "KR", or "AUTO")
             
         Returns:
             RiotAccount: Riot account information
@@ -146,19 +345,46 @@ class RiotApiClient:
             ApiKeyException: If the API key is invalid
             RateLimitException: If the rate limit is reached
         """
-        self._rate_limit_wait()
+        cache_key = (summoner_name.lower(), tag_line.lower())
+        cached = self.account_cache.get(cache_key)
+        if cached is not None:
+            logger.info(f"Account cache hit for: {summoner_name}#{tag_line}")
+            return cached
+        
+        known = self.riot_id_index.get(summoner_name, tag_line, max_age=self.riot_id_index_max_age)
+        if known is not None:
+            logger.info(f"Riot ID index hit for: {summoner_name}#{tag_line}")
+            account = RiotAccount(puuid=known["puuid"], gameName=known["gameName"], tagLine=known["tagLine"])
+            # Never trust the sighting for longer than the index would
+            remaining = self.riot_id_index_max_age - (time.time() * 1000 - known["seenAt"]) / 1000
+            self.account_cache.set(cache_key, account, ttl=min(self.account_cache.ttl, remaining))
+            return account
+        
+        if cache_key in self.missing_account_cache:
+            logger.info(f"Missing account cache hit for: {summoner_name}#{tag_line}")
+            raise AccountNotFoundException(summoner_name, tag_line)
         
-        regional_url = self.get_regional_base_url(region)
+        await self._rate_limit_wait()
+        
+        # Riot accounts are global, any routing cluster can resolve them
+        routing_region = self.default_routing_region if region == AUTO_REGION else region
+        regional_url = self.get_regional_base_url(routing_region)
         url = f"{regional_url}/riot/account/v1/accounts/by-riot-id/{summoner_name}/{tag_line}"
         
         logger.info(f"Fetching account: {summoner_name}#{tag_line} from regional URL: {regional_url}")
         
         try:
-            response = requests.get(url, headers=self.headers, timeout=10)
+            response = await self._get(url)
+            if response.status_code == 404:
+                self.missing_account_cache.set(cache_key, True)
+                self.riot_id_index.remove(summoner_name, tag_line)
             self._handle_response_errors(response, summoner_name, tag_line)
             
             data = response.json()
-            return RiotAccount(**data)
+            account = RiotAccount(**data)
+            self.account_cache.set(cache_key, account)
+            self.riot_id_index.add(account.puuid, account.gameName, account.tagLine)
+            return account
             
         except requests.exceptions.Timeout:
             raise RiotApiException("API request timeout", 408)
@@ -178,7 +404,12 @@ class RiotApiClient:
         Returns:
             SummonerInfo: Summoner information
         """
-        self._rate_limit_wait()
+        cached = self.summoner_cache.get((puuid, region))
+        if cached is not None:
+            logger.info(f"Summoner cache hit for: {puuid} in region {region}")
+            return cached
+        
+        await self._rate_limit_wait()
         
         platform_url = self.get_platform_base_url(region)
         url = f"{platform_url}/lol/summoner/v4/summoners/by-puuid/{puuid}"
@@ -186,12 +417,14 @@ class RiotApiClient:
         logger.info(f"Fetching summoner: {puuid} in region {region} from platform URL: {platform_url}")
         
         try:
-            response = requests.get(url, headers=self.headers, timeout=10)
+            response = await self._get(url)
             self._handle_response_errors(response)
             
             data = response.json()
             logger.info(f"Summoner API response data: {data}")  # Debug
-            return SummonerInfo(**data)
+            summoner = SummonerInfo(**data)
+            self.summoner_cache.set((puuid, region), summoner)
+            return summoner
             
         except requests.exceptions.Timeout:
             raise RiotApiException("API request timeout", 408)
@@ -211,7 +444,12 @@ class RiotApiClient:
         Returns:
             List[LeagueEntry]: List of rankings
         """
-        self._rate_limit_wait()
+        cached = self.league_cache.get((puuid, region))
+        if cached is not None:
+            logger.info(f"League entries cache hit for: {puuid} in region {region}")
+            return cached
+        
+        await self._rate_limit_wait()
     
         platform_url = self.get_platform_base_url(region)
         print(f"Fetching rankings for PUUID: {puuid} in region {region}")
@@ -220,12 +458,14 @@ class RiotApiClient:
         logger.info(f"Fetching rankings: {puuid} in region {region} from platform URL: {platform_url}")
 
         try:
-            response = requests.get(url, headers=self.headers, timeout=10)
+            response = await self._get(url)
             self._handle_response_errors(response)
             
             data = response.json()
             logger.info(f"League API response data: {data}")  # Debug
-            return [LeagueEntry(**entry) for entry in data]
+            entries = [LeagueEntry(**entry) for entry in data]
+            self.league_cache.set((puuid, region), entries)
+            return entries
             
         except requests.exceptions.Timeout:
             raise RiotApiException("API request timeout", 408)
@@ -233,6 +473,68 @@ class RiotApiClient:
             raise RiotApiException(f"Connection error: {str(e)}")
         
 
+    # Fetch an apex tier league (master, grandmaster, challenger)
+    async def get_apex_league(self, tier: str, queue: str = "RANKED_SOLO_5x5", region: str = "EUW") -> Dict[str, Any]:
+        """
+        Retrieves the full league of an apex tier
+        
+        Args:
+            tier: "MASTER", "GRANDMASTER" or "CHALLENGER"
+            queue: Queue type (e.g., "RANKED_SOLO_5x5", "RANKED_FLEX_SR")
+            region: Region code (e.g., "EUW", "NA", "KR")
+            
+        Returns:
+            Dict: League list with all of its entries
+        """
+        await self._rate_limit_wait()
+        
+        platform_url = self.get_platform_base_url(region)
+        url = f"{platform_url}/lol/league/v4/{tier.lower()}leagues/by-queue/{queue}"
+        
+        logger.info(f"Fetching {tier} league: {queue} in region {region} from platform URL: {platform_url}")
+        
+        try:
+            response = await self._get(url)
+            self._handle_response_errors(response)
+            return response.json()
+            
+        except requests.exceptions.Timeout:
+            raise RiotApiException("API request timeout", 408)
+        except requests.exceptions.RequestException as e:
+            raise RiotApiException(f"Connection error: {str(e)}")
+    
+    # Fetch one page of league entries for a tier and division
+    async def get_league_exp_entries(self, queue: str, tier: str, division: str, page: int = 1, region: str = "EUW") -> List[Dict[str, Any]]:
+        """
+        Retrieves one page of league entries (league-exp-v4)
+        
+        Args:
+            queue: Queue type (e.g., "RANKED_SOLO_5x5", "RANKED_FLEX_SR")
+            tier: Tier (e.g., "GOLD")
+            division: Division (e.g., "II")
+            page: Page number, starting at 1 (an empty page marks the end)
+            region: Region code (e.g., "EUW", "NA", "KR")
+            
+        Returns:
+            List[Dict]: League entries of the page
+        """
+        await self._rate_limit_wait()
+        
+        platform_url = self.get_platform_base_url(region)
+        url = f"{platform_url}/lol/league-exp/v4/entries/{queue}/{tier}/{division}"
+        
+        logger.info(f"Fetching league entries: {queue} {tier} {division} page {page} in region {region}")
+        
+        try:
+            response = await self._get(url, params={"page": page})
+            self._handle_response_errors(response)
+            return response.json()
+            
+        except requests.exceptions.Timeout:
+            raise RiotApiException("API request timeout", 408)
+        except requests.exceptions.RequestException as e:
+            raise RiotApiException(f"Connection error: {str(e)}")
+    
     # Fetch complete player info
     async def get_complete_player_info(self, summoner_name: str, tag_line: str, region: str = "EUW") -> Dict[str, Any]:
         """
@@ -241,7 +543,7 @@ class RiotApiClient:
         Args:
             summoner_name: Summoner name
             tag_line: Tag line
-            region: Region code (e.g., "EUW", "NA", "KR")
+            region: Region code (e.g., "EUW", "NA", "KR", or "AUTO" to detect it)
             
         Returns:
             Dict containing all player information
@@ -250,14 +552,18 @@ class RiotApiClient:
             # 1. Get Riot account
             account = await self.get_account_by_riot_id(summoner_name, tag_line, region)
             
-            # 2. Get summoner info
-            summoner = await self.get_summoner_by_puuid(account.puuid, region)
+            if region == AUTO_REGION:
+                region = await self.get_player_region(account.puuid)
             
-            # 3. Get rankings
-            league_entries = await self.get_league_entries(summoner.puuid, region)
+            # 2. Get summoner info and 3. rankings (both only need the PUUID)
+            summoner, league_entries = await asyncio.gather(
+                self.get_summoner_by_puuid(account.puuid, region),
+                self.get_league_entries(account.puuid, region)
+            )
             logger.info(f"Complete information retrieved for {summoner_name}#{tag_line} in region {region}")
             
             return {
+                "region": region,
                 "account": account.dict(),
                 "summoner": summoner.dict(),
                 "rankings": [entry.dict() for entry in league_entries]
@@ -283,7 +589,13 @@ class RiotApiClient:
         Returns:
             List[str]: List of match IDs
         """
-        self._rate_limit_wait()
+        cache_key = (puuid, region, start, count)
+        cached = self.match_history_cache.get(cache_key)
+        if cached is not None:
+            logger.info(f"Match history cache hit for: {puuid} (start={start}, count={count})")
+            return cached
+        
+        await self._rate_limit_wait()
         
         regional_url = self.get_regional_base_url(region)
         url = f"{regional_url}/lol/match/v5/matches/by-puuid/{puuid}/ids"
@@ -297,12 +609,13 @@ class RiotApiClient:
         logger.info(f"Fetching match history: {puuid} in region {region} (start={start}, count={count})")
         
         try:
-            response = requests.get(url, headers=self.headers, params=params, timeout=10)
+            response = await self._get(url, params=params)
             self._handle_response_errors(response)
             
             data = response.json()
             print(f"Match history API response data: {data}")  # Debug
             logger.info(f"Match history API response: {len(data)} matches found")
+            self.match_history_cache.set(cache_key, data)
             return data
             
         except requests.exceptions.Timeout:
@@ -322,7 +635,12 @@ class RiotApiClient:
         Returns:
             Dict: Complete match data
         """
-        self._rate_limit_wait()
+        cached = self.get_cached_match_details(match_id)
+        if cached is not None:
+            logger.info(f"Match details cache hit for: {match_id}")
+            return cached
+        
+        await self._rate_limit_wait()
         
         regional_url = self.get_regional_base_url(region)
         url = f"{regional_url}/lol/match/v5/matches/{match_id}"
@@ -330,11 +648,13 @@ class RiotApiClient:
         logger.info(f"Fetching match details for: {match_id} in region {region} from regional URL: {regional_url}")
         
         try:
-            response = requests.get(url, headers=self.headers, timeout=10)
+            response = await self._get(url)
             self._handle_response_errors(response)
             
             data = response.json()
             logger.info(f"Match details API response: Match {match_id} retrieved successfully")
+            self.match_cache.set(match_id, data)
+            self.riot_id_index.add_match(data)
             return data
             
         except requests.exceptions.Timeout:
@@ -342,6 +662,189 @@ class RiotApiClient:
         except requests.exceptions.RequestException as e:
             raise RiotApiException(f"Connection error: {str(e)}")
     
+    # Resolve the platform a player plays on
+    async def get_player_region(self, puuid: str) -> str:
+        """
+        Determines the region (platform) a player is active on
+        
+        Asks account-v1 for the player's active region first and falls back to
+        probing every platform concurrently. The result is cached per PUUID.
+        
+        Args:
+            puuid: Player PUUID
+            
+        Returns:
+            str: Region code (e.g., "EUW", "NA", "KR")
+            
+        Raises:
+            PlayerNotFoundException: If no platform knows the player
+        """
+        cached = self.player_region_cache.get(puuid)
+        if cached is not None:
+            return cached
+        
+        region = await self._get_active_region(puuid)
+        if region is None:
+            region = await self._probe_player_region(puuid)
+        
+        logger.info(f"Resolved region {region} for PUUID: {puuid}")
+        self.player_region_cache.set(puuid, region)
+        return region
+    
+    async def _get_active_region(self, puuid: str) -> Optional[str]:
+        """Reads the player's active LoL platform from account-v1, None if unavailable"""
+        await self._rate_limit_wait()
+        
+        regional_url = self.get_regional_base_url(self.default_routing_region)
+        url = f"{regional_url}/riot/account/v1/region/by-game/lol/by-puuid/{puuid}"
+        
+        try:
+            response = await self._get(url)
+            if response.status_code != 200:
+                logger.warning(f"Active region lookup failed for {puuid}: {response.status_code}")
+                return None
+            return self.platform_regions.get(response.json().get("region", "").lower())
+        except (requests.exceptions.RequestException, ValueError) as e:
+            logger.warning(f"Active region lookup failed for {puuid}: {str(e)}")
+            return None
+    
+    async def _probe_player_region(self, puuid: str) -> str:
+        """
+        Queries summoner-v4 on every platform concurrently and keeps the first hit
+        
+        A failing platform is skipped. Raises PlayerNotFoundException if every
+        platform answered 404, else the error of a platform that could not answer.
+        """
+        async def probe(region: str) -> str:
+            await self.get_summoner_by_puuid(puuid, region)
+            return region
+        
+        tasks = [asyncio.create_task(probe(region)) for region in self.platform_endpoints]
+        failure: Optional[RiotApiException] = None
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                try:
+                    return await next_done
+                except AccountNotFoundException:
+                    continue
+                except RiotApiException as e:
+                    logger.warning(f"Region probe failed for {puuid}: {str(e)}")
+                    failure = failure or e
+        finally:
+            for task in tasks:
+                task.cancel()
+        
+        # The player may be on a platform that could not answer
+        if failure is not None:
+            raise failure
+        raise PlayerNotFoundException(puuid)
+    
+    # Fetch active game by PUUID
+    async def get_active_game(self, puuid: str, region: str = "EUW") -> Dict[str, Any]:
+        """
+        Retrieves the game a player is currently in (spectator-v5)
+        
+        Args:
+            puuid: Player PUUID
+            region: Region code (e.g., "EUW", "NA", "KR")
+            
+        Returns:
+            Dict: Current game information (participants, bans, queue, ...)
+            
+        Raises:
+            ActiveGameNotFoundException: If the player is not in a game
+        """
+        cached = self.active_game_cache.get((puuid, region))
+        if cached is not None:
+            logger.info(f"Active game cache hit for: {puuid} in region {region}")
+            return cached
+        
+        await self._rate_limit_wait()
+        
+        platform_url = self.get_platform_base_url(region)
+        url = f"{platform_url}/lol/spectator/v5/active-games/by-summoner/{puuid}"
+        
+        logger.info(f"Fetching active game: {puuid} in region {region} from platform URL: {platform_url}")
+        
+        try:
+            response = await self._get(url)
+            if response.status_code == 404:
+                raise ActiveGameNotFoundException(puuid)
+            self._handle_response_errors(response)
+            
+            data = response.json()
+            # Every participant of the game gets the same answer
+            for participant in data.get("participants", []):
+                if participant.get("puuid"):
+                    self.active_game_cache.set((participant["puuid"], region), data)
+            self.active_game_cache.set((puuid, region), data)
+            self.riot_id_index.add_active_game(data)
+            return data
+            
+        except requests.exceptions.Timeout:
+            raise RiotApiException("API request timeout", 408)
+        except requests.exceptions.RequestException as e:
+            raise RiotApiException(f"Connection error: {str(e)}")
+    
+    # Fetch match timeline summary by match ID
+    async def get_match_timeline(self, match_id: str, region: str = "EUW") -> Dict[str, Any]:
+        """
+        Retrieves a match timeline reduced to compact derived series
+        
+        The timeline is parsed while it downloads, frame by frame, so the raw
+        document is never held in memory as a whole.
+        
+        Args:
+            match_id: Match ID (e.g., "EUW1_7460265918")
+            region: Region code (e.g., "EUW", "NA", "KR")
+            
+        Returns:
+            Dict: Gold/XP difference curves, per-participant series and key events
+        """
+        cached = self.timeline_cache.get(match_id)
+        if cached is not None:
+            logger.info(f"Match timeline cache hit for: {match_id}")
+            return cached
+        
+        await self._rate_limit_wait()
+        
+        regional_url = self.get_regional_base_url(region)
+        url = f"{regional_url}/lol/match/v5/matches/{match_id}/timeline"
+        
+        logger.info(f"Fetching match timeline for: {match_id} in region {region} from regional URL: {regional_url}")
+        
+        def fetch_and_summarize() -> Dict[str, Any]:
+            with self.session.get(url, headers=self.headers, timeout=10, stream=True) as response:
+                self._handle_response_errors(response)
+                return summarize_timeline(response.iter_content(chunk_size=64 * 1024))
+        
+        self._in_flight += 1
+        try:
+            summary = await asyncio.to_thread(fetch_and_summarize)
+            self.timeline_cache.set(match_id, summary)
+            return summary
+            
+        except requests.exceptions.Timeout:
+            raise RiotApiException("API request timeout", 408)
+        except requests.exceptions.RequestException as e:
+            raise RiotApiException(f"Connection error: {str(e)}")
+        except ValueError as e:
+            raise RiotApiException(f"Invalid timeline data: {str(e)}", 502)
+        finally:
+            self._in_flight -= 1
+    
+    def get_cached_match_details(self, match_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Returns match details from the local cache without calling the API
+        
+        Args:
+            match_id: Match ID (e.g., "EUW1_7460265918")
+            
+        Returns:
+            Optional[Dict]: Cached match data, or None if not cached
+        """
+        return self.match_cache.get(match_id)
+    
     def get_platform_base_url(self, region: str) -> str:
         """
         Get the platform base URL for a specific region (pour données spécifiques au serveur)
@@ -373,6 +876,3 @@ class RiotApiClient:
         return self.regional_endpoints[region]
 
 
-# Global client instance
-riot_client = RiotApiClient()
-
@@ -0,0 +1,131 @@
+"""
+In-process caching utilities
+Keeps recently fetched Riot API data in memory to avoid redundant upstream calls
+"""
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+import logging
+import os
+import pickle
+import time
+import zlib
+
+
+logger = logging.getLogger(__name__)
+
+# Bumped whenever the snapshot layout changes; older snapshots are ignored
+SNAPSHOT_VERSION = 1
+
+
+class TTLCache:
+    """Bounded LRU cache whose entries expire after a fixed time-to-live"""
+
+    def __init__(self, max_size: int = 1024, ttl: float = 300.0):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """
+        Returns the cached value for a key, or None if missing or expired
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        value, expires_at = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """
+        Stores a value, evicting the least recently used entry when full
+        """
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        self._entries[key] = (value, expires_at)
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self.get(key) is not None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self) -> None:
+        """Removes every entry"""
+        self._entries.clear()
+
+    def snapshot(self) -> List[Tuple[Hashable, Any, float]]:
+        """
+        Returns the live entries as (key, value, remaining TTL) triples, least recently used first
+        """
+        now = time.monotonic()
+        return [
+            (key, value, expires_at - now)
+            for key, (value, expires_at) in self._entries.items()
+            if expires_at > now
+        ]
+
+    def restore(self, entries: List[Tuple[Hashable, Any, float]], age: float = 0.0) -> int:
+        """
+        Loads entries from a snapshot, shortening their TTL by the snapshot's age
+
+        Returns:
+            int: Number of entries still alive and restored
+        """
+        restored = 0
+        for key, value, remaining in entries:
+            if remaining - age > 0:
+                self.set(key, value, ttl=remaining - age)
+                restored += 1
+        return restored
+
+
+def save_snapshot(snapshots: Dict[str, List[Tuple[Hashable, Any, float]]], path: str) -> None:
+    """
+    Writes cache snapshots (see TTLCache.snapshot) to a compressed file, atomically
+
+    Args:
+        snapshots: Snapshot of each cache, by cache name
+        path: Destination file
+    """
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    payload = {"version": SNAPSHOT_VERSION, "saved_at": time.time(), "caches": snapshots}
+    data = zlib.compress(pickle.dumps(payload, protocol=pickle.HIGHEST_PROTOCOL), 6)
+
+    temporary_path = f"{path}.tmp"
+    with open(temporary_path, "wb") as file:
+        file.write(data)
+    os.replace(temporary_path, path)
+
+
+def load_snapshot(path: str) -> Tuple[Dict[str, List[Tuple[Hashable, Any, float]]], float]:
+    """
+    Reads cache snapshots written by save_snapshot
+
+    The file must only ever be written by this application: it is unpickled.
+
+    Returns:
+        Tuple: Snapshot of each cache by name, and the snapshot's age in seconds
+               (empty if the file is missing, unreadable or from another version)
+    """
+    try:
+        with open(path, "rb") as file:
+            payload = pickle.loads(zlib.decompress(file.read()))
+    except FileNotFoundError:
+        return {}, 0.0
+    except Exception as e:
+        logger.warning(f"Ignoring unreadable cache snapshot {path}: {str(e)}")
+        return {}, 0.0
+
+    if payload.get("version") != SNAPSHOT_VERSION:
+        logger.warning(f"Ignoring cache snapshot {path} from another version")
+        return {}, 0.0
+    return payload["caches"], max(0.0, time.time() - payload["saved_at"])
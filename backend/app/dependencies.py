@@ -2,10 +2,12 @@
 Dependency injection setup for FastAPI
 Provides shared resources and configurations
 """
-from fastapi import Depends
-from functools import lru_cache
+from fastapi import Request, Depends, HTTPException, Query
+from typing import List, Optional
 from .api import RiotApiClient
-from .services import PlayerService, MatchService
+from .services import PlayerService, MatchService, LadderService, AnalyticsService
+from .admission import AdmissionController, AdmissionRejectedException, AdmissionTooLargeException
+from .quota import ConsumerQuota, QuotaExceededException
 import logging
 
 
@@ -14,37 +16,44 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
-@lru_cache()
-def get_riot_client() -> RiotApiClient:
+def get_riot_client(request: Request) -> RiotApiClient:
     """
     Dependency provider for RiotApiClient
-    Uses lru_cache to ensure singleton behavior
+    Returns the single client created by the application lifespan
     """
-    return RiotApiClient()
+    return request.app.state.riot_client
 
 
-def get_player_service(
-    riot_client: RiotApiClient = Depends(get_riot_client)
-) -> PlayerService:
+def get_player_service(request: Request) -> PlayerService:
     """
     Dependency provider for PlayerService
-    Injects RiotApiClient dependency
+    Shares the RiotApiClient created by the application lifespan
     """
-    service = PlayerService()
-    service.riot_client = riot_client
-    return service
+    return request.app.state.player_service
 
 
-def get_match_service(
-    riot_client: RiotApiClient = Depends(get_riot_client)
-) -> MatchService:
+def get_match_service(request: Request) -> MatchService:
     """
     Dependency provider for MatchService
-    Injects RiotApiClient dependency
+    Shares the RiotApiClient created by the application lifespan
     """
-    service = MatchService()
-    service.riot_client = riot_client
-    return service
+    return request.app.state.match_service
+
+
+def get_ladder_service(request: Request) -> LadderService:
+    """
+    Dependency provider for LadderService
+    Shares the ladder index filled by the scheduled ingestion
+    """
+    return request.app.state.ladder_service
+
+
+def get_analytics_service(request: Request) -> AnalyticsService:
+    """
+    Dependency provider for AnalyticsService
+    Shares the champion statistics fed by every stored match
+    """
+    return request.app.state.analytics_service
 
 
 def get_logger() -> logging.Logger:
@@ -52,3 +61,154 @@ def get_logger() -> logging.Logger:
     Dependency provider for logger
     """
     return logger
+
+
+def get_admission_controller(request: Request) -> AdmissionController:
+    """
+    Dependency provider for AdmissionController
+    """
+    return request.app.state.admission_controller
+
+
+async def get_consumer(request: Request) -> str:
+    """
+    Dependency provider for the consumer key (configured API key or client ID, else client IP)
+    """
+    quota = request.app.state.admission_controller.consumer_quota
+    if quota is None:
+        return ConsumerQuota.client_ip(request)
+    return quota.identify(request)
+
+
+def admit_upstream_calls(
+    controller: AdmissionController,
+    calls: int,
+    consumer: Optional[str] = None,
+    progressive: bool = False
+) -> None:
+    """
+    Fails fast with 503 and Retry-After when the Riot API budget cannot serve the calls in time,
+    with 429 and Retry-After when the consumer has used up its share of the budget,
+    or with 413 when the request could never be served and must ask for fewer items
+
+    Must run on the event loop (async dependencies or routes): the caches and
+    counters it reads are not thread-safe.
+    """
+    try:
+        controller.admit(calls, consumer, progressive)
+    except AdmissionTooLargeException as e:
+        logger.warning(f"Request rejected by admission control: {str(e)}")
+        raise HTTPException(status_code=413, detail=str(e))
+    except AdmissionRejectedException as e:
+        logger.warning(f"Request rejected by admission control: {str(e)}")
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": str(e.retry_after)})
+    except QuotaExceededException as e:
+        logger.warning(f"Request rejected by consumer quota: {str(e)}")
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": str(e.retry_after)})
+
+
+async def admit_account(
+    summoner_name: str,
+    tag_line: str,
+    controller: AdmissionController = Depends(get_admission_controller),
+    consumer: str = Depends(get_consumer)
+) -> None:
+    """Admission check for account lookups"""
+    admit_upstream_calls(controller, controller.estimate_account(summoner_name, tag_line), consumer)
+
+
+async def admit_player(
+    summoner_name: str,
+    tag_line: str,
+    region: str = Query(default="EUW"),
+    controller: AdmissionController = Depends(get_admission_controller),
+    consumer: str = Depends(get_consumer)
+) -> None:
+    """Admission check for complete player lookups"""
+    admit_upstream_calls(controller, controller.estimate_player(summoner_name, tag_line, region), consumer)
+
+
+async def admit_live_game(
+    summoner_name: str,
+    tag_line: str,
+    region: str = Query(default="EUW"),
+    controller: AdmissionController = Depends(get_admission_controller),
+    consumer: str = Depends(get_consumer)
+) -> None:
+    """Admission check for live game scouting"""
+    admit_upstream_calls(controller, controller.estimate_live_game(summoner_name, tag_line, region), consumer)
+
+
+async def admit_summoner(
+    puuid: str,
+    region: str = Query(default="EUW"),
+    controller: AdmissionController = Depends(get_admission_controller),
+    consumer: str = Depends(get_consumer)
+) -> None:
+    """Admission check for summoner lookups"""
+    admit_upstream_calls(controller, controller.estimate_summoner(puuid, region), consumer)
+
+
+async def admit_league_entries(
+    summoner_id: str,
+    region: str = Query(default="EUW"),
+    controller: AdmissionController = Depends(get_admission_controller),
+    consumer: str = Depends(get_consumer)
+) -> None:
+    """Admission check for league entry lookups"""
+    admit_upstream_calls(controller, controller.estimate_league_entries(summoner_id, region), consumer)
+
+
+async def admit_match_history(
+    puuid: str,
+    region: str = Query(default="EUW"),
+    start: int = Query(default=0),
+    count: int = Query(default=20),
+    controller: AdmissionController = Depends(get_admission_controller),
+    consumer: str = Depends(get_consumer)
+) -> None:
+    """Admission check for match history lookups"""
+    admit_upstream_calls(controller, controller.estimate_match_history(puuid, region, start, count), consumer)
+
+
+async def admit_match_details(
+    match_id: str,
+    controller: AdmissionController = Depends(get_admission_controller),
+    consumer: str = Depends(get_consumer)
+) -> None:
+    """Admission check for match detail lookups"""
+    admit_upstream_calls(controller, controller.estimate_match_details([match_id]), consumer)
+
+
+async def admit_match_stream(
+    puuid: Optional[str] = Query(default=None),
+    ids: Optional[List[str]] = Query(default=None),
+    region: str = Query(default="EUW"),
+    start: int = Query(default=0),
+    count: int = Query(default=20),
+    controller: AdmissionController = Depends(get_admission_controller),
+    consumer: str = Depends(get_consumer)
+) -> None:
+    """Admission check for streamed match details"""
+    if ids:
+        calls = controller.estimate_match_details(ids)
+    elif puuid:
+        history_calls = controller.estimate_match_history(puuid, region, start, count)
+        if history_calls:
+            calls = history_calls + count
+        else:
+            match_ids = controller.riot_client.match_history_cache.get((puuid, region.upper(), start, count))
+            calls = controller.estimate_match_details(match_ids)
+    else:
+        calls = 0
+    # Match details are streamed as they arrive
+    admit_upstream_calls(controller, calls, consumer, progressive=True)
+
+
+async def admit_match_timeline(
+    match_id: str,
+    controller: AdmissionController = Depends(get_admission_controller),
+    consumer: str = Depends(get_consumer)
+) -> None:
+    """Admission check for match timeline lookups"""
+    admit_upstream_calls(controller, controller.estimate_match_timeline(match_id), consumer)
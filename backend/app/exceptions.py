@@ -16,6 +16,13 @@ class AccountNotFoundException(RiotApiException):
         super().__init__(message, 404)
 
 
+class PlayerNotFoundException(AccountNotFoundException):
+    """Raised when no platform knows a player"""
+    def __init__(self, puuid: str):
+        message = f"No summoner found on any platform for player: {puuid}"
+        RiotApiException.__init__(self, message, 404)
+
+
 class RateLimitException(RiotApiException):
     """Raised when API rate limit is reached"""
     def __init__(self):
@@ -35,3 +42,10 @@ class ServiceUnavailableException(RiotApiException):
     def __init__(self):
         message = "Riot Games service temporarily unavailable"
         super().__init__(message, 503)
+
+
+class ActiveGameNotFoundException(RiotApiException):
+    """Raised when a player is not currently in a game"""
+    def __init__(self, puuid: str):
+        message = f"No active game found for player: {puuid}"
+        super().__init__(message, 404)
@@ -0,0 +1,166 @@
+"""
+Bulk export of stored matches
+Streams matches as NDJSON or Parquet with memory bounded by one batch
+"""
+from typing import Any, Dict, Iterable, Iterator, List, Tuple, Union, get_args, get_origin
+import json
+
+from pydantic import BaseModel
+
+from .models import ParticipantDto
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Parquet export is optional
+    pa = None
+    pq = None
+
+
+class ParquetUnavailableError(RuntimeError):
+    """Raised when Parquet export is requested but pyarrow is not installed"""
+    def __init__(self):
+        super().__init__("Parquet export requires pyarrow (pip install pyarrow)")
+
+
+# Match-level columns repeated on every participant row
+MATCH_COLUMNS: List[Tuple[str, type]] = [
+    ("matchId", str),
+    ("platformId", str),
+    ("gameCreation", int),
+    ("gameDuration", int),
+    ("gameVersion", str),
+    ("queueId", int),
+]
+
+
+SCALAR_TYPES = (int, float, bool, str)
+
+
+def _unwrap_optional(annotation: Any) -> Any:
+    if get_origin(annotation) is Union:
+        return next(arg for arg in get_args(annotation) if arg is not type(None))
+    return annotation
+
+
+def _participant_columns() -> List[Tuple[str, type, Tuple[str, ...]]]:
+    """
+    Flattens ParticipantDto into (column, type, path) triples
+
+    Nested models made only of scalars (challenges) become prefixed columns,
+    deeper structures (perks) are kept as a JSON string column.
+    """
+    columns = []
+    for name, field in ParticipantDto.model_fields.items():
+        annotation = _unwrap_optional(field.annotation)
+        if not (isinstance(annotation, type) and issubclass(annotation, BaseModel)):
+            columns.append((name, annotation, (name,)))
+            continue
+
+        nested = {sub_name: _unwrap_optional(sub.annotation) for sub_name, sub in annotation.model_fields.items()}
+        if all(sub_type in SCALAR_TYPES for sub_type in nested.values()):
+            columns.extend((f"{name}_{sub_name}", sub_type, (name, sub_name)) for sub_name, sub_type in nested.items())
+        else:
+            columns.append((name, dict, (name,)))
+    return columns
+
+
+PARTICIPANT_COLUMNS = _participant_columns()
+EXPORT_COLUMNS = MATCH_COLUMNS + [(column, column_type) for column, column_type, _ in PARTICIPANT_COLUMNS]
+
+
+def iter_participant_rows(matches: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+    """
+    Yields one flat row per participant of every match
+    """
+    for match in matches:
+        info = match.get("info", {})
+        match_values = {
+            "matchId": match.get("metadata", {}).get("matchId"),
+            **{column: info.get(column) for column, _ in MATCH_COLUMNS if column != "matchId"},
+        }
+        for participant in info.get("participants", []):
+            row = dict(match_values)
+            for column, column_type, path in PARTICIPANT_COLUMNS:
+                value = participant
+                for key in path:
+                    value = value.get(key) if isinstance(value, dict) else None
+                if column_type is dict and value is not None:
+                    value = json.dumps(value, separators=(",", ":"))
+                row[column] = value
+            yield row
+
+
+def iter_ndjson(records: Iterable[Dict[str, Any]]) -> Iterator[bytes]:
+    """
+    Encodes records (matches or participant rows) as newline-delimited JSON
+    """
+    for record in records:
+        yield (json.dumps(record, separators=(",", ":")) + "\n").encode()
+
+
+class _StreamSink:
+    """Write-only file object collecting Parquet output until it is drained"""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+        self._position = 0
+        self.closed = False
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._chunks.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.closed = True
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def _arrow_schema() -> "pa.Schema":
+    arrow_types = {int: pa.int64(), float: pa.float64(), bool: pa.bool_(), str: pa.string(), dict: pa.string()}
+    return pa.schema([(column, arrow_types[column_type]) for column, column_type in EXPORT_COLUMNS])
+
+
+def iter_parquet(rows: Iterable[Dict[str, Any]], row_group_size: int = 10000) -> Iterator[bytes]:
+    """
+    Encodes participant rows as a Parquet file, yielding each row group as soon as it is written
+
+    Raises:
+        ParquetUnavailableError: If pyarrow is not installed
+    """
+    if pa is None:
+        raise ParquetUnavailableError()
+
+    schema = _arrow_schema()
+    sink = _StreamSink()
+    writer = pq.ParquetWriter(sink, schema, compression="snappy")
+    batch: List[Dict[str, Any]] = []
+
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= row_group_size:
+            writer.write_table(pa.Table.from_pylist(batch, schema=schema))
+            batch = []
+            yield sink.drain()
+
+    if batch:
+        writer.write_table(pa.Table.from_pylist(batch, schema=schema))
+    writer.close()
+    yield sink.drain()
+
+
+def parquet_available() -> bool:
+    """Returns True if Parquet export can be used"""
+    return pa is not None
@@ -0,0 +1,107 @@
+"""
+Local ranked ladder index
+Answers rank percentile and leaderboard queries without calling the Riot API
+"""
+from array import array
+from bisect import bisect_right
+from typing import Dict, List, Optional, Tuple
+import time
+
+
+TIERS = ["IRON", "BRONZE", "SILVER", "GOLD", "PLATINUM", "EMERALD", "DIAMOND", "MASTER", "GRANDMASTER", "CHALLENGER"]
+APEX_TIERS = ["MASTER", "GRANDMASTER", "CHALLENGER"]
+DIVISIONS = ["IV", "III", "II", "I"]
+
+# Apex players are ordered by LP only, above every divisional rank
+APEX_BASE_SCORE = TIERS.index("MASTER") * 400
+
+
+def rank_score(tier: str, division: str, league_points: int) -> int:
+    """
+    Maps a rank to a single integer that sorts like the ladder
+
+    Args:
+        tier: Tier name (e.g., "GOLD")
+        division: Division (e.g., "II"), ignored for apex tiers
+        league_points: League points
+
+    Returns:
+        int: Comparable rank score
+    """
+    tier = tier.upper()
+    if tier in APEX_TIERS:
+        return APEX_BASE_SCORE + league_points
+    return TIERS.index(tier) * 400 + DIVISIONS.index(division.upper()) * 100 + min(league_points, 100)
+
+
+class _QueueLadder:
+    """Sorted rank scores of one (region, queue) plus its apex leaderboard"""
+
+    def __init__(self, scores: array, apex_entries: List[dict], truncated: bool = False):
+        self.scores = scores
+        self.apex_entries = apex_entries
+        # Some divisions were cut at the page limit, so scores under-represent them
+        self.truncated = truncated
+        self.updated_at = time.time()
+
+
+class LadderIndex:
+    """In-memory ladder snapshots, one per (region, queue)"""
+
+    def __init__(self):
+        self._ladders: Dict[Tuple[str, str], _QueueLadder] = {}
+
+    def replace(
+        self, region: str, queue: str, scores: array, apex_entries: List[dict], truncated: bool = False
+    ) -> None:
+        """
+        Swaps in a freshly ingested ladder
+
+        Args:
+            region: Region code (e.g., "EUW")
+            queue: Queue type (e.g., "RANKED_SOLO_5x5")
+            scores: Rank scores of every ranked player (any order)
+            apex_entries: Master, grandmaster and challenger league entries
+            truncated: True if some divisions were not paged through completely
+        """
+        sorted_scores = array("i", sorted(scores))
+        leaderboard = sorted(apex_entries, key=lambda entry: entry["leaguePoints"], reverse=True)
+        self._ladders[(region, queue)] = _QueueLadder(sorted_scores, leaderboard, truncated)
+
+    def percentile(self, region: str, queue: str, tier: str, division: str, league_points: int) -> Optional[float]:
+        """
+        Returns the "top X%" position of a rank, or None if the ladder is not ingested
+        or truncated (divisions cut at the page limit would skew the distribution)
+        """
+        ladder = self._ladders.get((region, queue))
+        if ladder is None or not ladder.scores or ladder.truncated:
+            return None
+
+        score = rank_score(tier, division, league_points)
+        players_above = len(ladder.scores) - bisect_right(ladder.scores, score)
+        return round((players_above + 1) / len(ladder.scores) * 100, 2)
+
+    def leaderboard(self, region: str, queue: str, start: int = 0, count: int = 50) -> Optional[List[dict]]:
+        """
+        Returns one page of the apex leaderboard, or None if the ladder is not ingested
+        """
+        ladder = self._ladders.get((region, queue))
+        if ladder is None:
+            return None
+
+        page = ladder.apex_entries[start:start + count]
+        return [{"position": start + offset + 1, **entry} for offset, entry in enumerate(page)]
+
+    def stats(self, region: str, queue: str) -> Optional[dict]:
+        """
+        Returns the size and age of a ladder, or None if it is not ingested
+        """
+        ladder = self._ladders.get((region, queue))
+        if ladder is None:
+            return None
+        return {
+            "players": len(ladder.scores),
+            "apexPlayers": len(ladder.apex_entries),
+            "truncated": ladder.truncated,
+            "updatedAt": ladder.updated_at
+        }
@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import Optional, Union, List, Dict, Any
 from datetime import datetime
 
@@ -51,6 +51,18 @@ class ApiResponse(BaseModel):
     status_code: Optional[int] = None
 
 
+class PlayerLookup(BaseModel):
+    """Model for a single Riot ID lookup in a bulk request"""
+    gameName: str
+    tagLine: str
+    region: str = "EUW"
+
+
+class BulkPlayerLookupRequest(BaseModel):
+    """Model for a bulk player lookup request (lobby or clash team scouting)"""
+    players: List[PlayerLookup] = Field(..., min_length=1, max_length=50)
+
+
 class ObjectiveDto(BaseModel):
     """Model for objective information"""
     first: bool
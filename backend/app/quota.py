@@ -0,0 +1,184 @@
+"""
+Fair-share quotas for inbound consumers
+Keeps any single consumer from draining the shared Riot API budget
+"""
+from collections import deque
+from typing import Deque, Dict, List, Optional, Tuple
+import math
+import time
+
+from fastapi import Request
+
+
+class QuotaExceededException(Exception):
+    """Raised when a consumer has used up its share of the Riot API budget"""
+    def __init__(self, consumer: str, upstream_calls: int, retry_after: float):
+        self.consumer = consumer
+        self.upstream_calls = upstream_calls
+        self.retry_after = max(1, math.ceil(retry_after))
+        super().__init__(
+            f"Quota exceeded for {consumer}: {upstream_calls} upstream calls needed. "
+            f"Retry in {self.retry_after}s."
+        )
+
+
+class _ConsumerUsage:
+    """Upstream calls charged to one consumer over the budget window"""
+
+    def __init__(self):
+        self.charges: Deque[Tuple[float, int]] = deque()
+        self.calls_in_window = 0
+        self.total_calls = 0
+        self.cache_hits = 0
+        self.rejected = 0
+        self.last_seen = time.monotonic()
+
+    def expire(self, cutoff: float) -> None:
+        while self.charges and self.charges[0][0] <= cutoff:
+            _, calls = self.charges.popleft()
+            self.calls_in_window -= calls
+
+
+class ConsumerQuota:
+    """
+    Weighted fair share of the Riot API budget per consumer
+
+    Every consumer with upstream usage in the current window is active. A consumer
+    may use its weight's proportion of the window budget among active consumers,
+    never more than max_share of it. Requests served from cache are never charged.
+    """
+
+    def __init__(
+        self,
+        budget: int,
+        window: float,
+        max_share: float = 0.5,
+        weights: Optional[Dict[str, float]] = None
+    ):
+        self.budget = budget
+        self.window = window
+        self.max_share = max_share
+        self.weights = weights or {}
+        self._usage: Dict[str, _ConsumerUsage] = {}
+
+    def identify(self, request: Request) -> str:
+        """
+        Returns the consumer key of a request: API key, then client ID, then client IP
+
+        Only API keys and client IDs configured in the weights are honored; anything
+        else falls back to the client IP, so inventing new identifiers gains nothing.
+        """
+        api_key = request.headers.get("X-API-Key")
+        if api_key and f"key:{api_key}" in self.weights:
+            return f"key:{api_key}"
+        client_id = request.headers.get("X-Client-ID")
+        if client_id and f"client:{client_id}" in self.weights:
+            return f"client:{client_id}"
+        return self.client_ip(request)
+
+    @staticmethod
+    def client_ip(request: Request) -> str:
+        """Returns the IP consumer key of a request"""
+        return f"ip:{request.client.host if request.client else 'unknown'}"
+
+    @staticmethod
+    def parse_weights(value: str) -> Dict[str, float]:
+        """Parses "key:abc=3,client:web=2" into a weight mapping"""
+        weights = {}
+        for item in value.split(","):
+            if "=" in item:
+                consumer, weight = item.rsplit("=", 1)
+                weights[consumer.strip()] = float(weight)
+        return weights
+
+    @staticmethod
+    def mask(consumer: str) -> str:
+        # Never echo API keys back in usage reports
+        if consumer.startswith("key:"):
+            return f"key:{consumer[4:8]}***"
+        return consumer
+
+    def _get_usage(self, consumer: str) -> _ConsumerUsage:
+        usage = self._usage.get(consumer)
+        if usage is None:
+            usage = _ConsumerUsage()
+            self._usage[consumer] = usage
+        usage.last_seen = time.monotonic()
+        return usage
+
+    def _expire_all(self) -> None:
+        cutoff = time.monotonic() - self.window
+        for consumer, usage in list(self._usage.items()):
+            usage.expire(cutoff)
+            # Forget idle consumers entirely after a few windows
+            if not usage.charges and usage.last_seen < cutoff - 3 * self.window:
+                del self._usage[consumer]
+
+    def allowance(self, consumer: str) -> int:
+        """
+        Returns how many upstream calls the consumer may make in the current window
+        """
+        self._expire_all()
+        weight = self.weights.get(consumer, 1.0)
+        active_weight = weight + sum(
+            self.weights.get(other, 1.0)
+            for other, usage in self._usage.items()
+            if other != consumer and usage.calls_in_window > 0
+        )
+        share = min(self.max_share, weight / active_weight)
+        return max(1, int(self.budget * share))
+
+    def max_allowance(self) -> int:
+        """
+        Returns the allowance of a consumer when it is the only active one
+        """
+        return max(1, int(self.budget * min(self.max_share, 1.0)))
+
+    def charge(self, consumer: str, calls: int) -> None:
+        """
+        Charges upstream calls to a consumer, or raises QuotaExceededException
+
+        Requests without upstream calls only count as cache hits. The allowance
+        check and the charge must stay in one synchronous step on the event loop,
+        so concurrent requests cannot overshoot the allowance.
+        """
+        usage = self._get_usage(consumer)
+        if calls <= 0:
+            usage.cache_hits += 1
+            return
+
+        allowance = self.allowance(consumer)
+        if usage.calls_in_window + calls > allowance:
+            usage.rejected += 1
+            raise QuotaExceededException(self.mask(consumer), calls, self._seconds_until_allowed(usage, calls, allowance))
+
+        usage.charges.append((time.monotonic(), calls))
+        usage.calls_in_window += calls
+        usage.total_calls += calls
+
+    def _seconds_until_allowed(self, usage: _ConsumerUsage, calls: int, allowance: int) -> float:
+        excess = usage.calls_in_window + calls - allowance
+        if calls > allowance:
+            return self.window
+        freed = 0
+        for timestamp, charged in usage.charges:
+            freed += charged
+            if freed >= excess:
+                return max(0.0, timestamp + self.window - time.monotonic())
+        return self.window
+
+    def usage(self, consumer: str) -> dict:
+        """
+        Returns the usage of one consumer over the current window
+        """
+        self._expire_all()
+        usage = self._usage.get(consumer) or _ConsumerUsage()
+        return {
+            "consumer": self.mask(consumer),
+            "weight": self.weights.get(consumer, 1.0),
+            "callsInWindow": usage.calls_in_window,
+            "allowance": self.allowance(consumer),
+            "totalCalls": usage.total_calls,
+            "cacheHits": usage.cache_hits,
+            "rejected": usage.rejected,
+        }
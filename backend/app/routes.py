@@ -3,18 +3,46 @@ Refactored routes following clean architecture principles
 Separates HTTP concerns from business logic
 """
 from fastapi import APIRouter, HTTPException, Query, Depends
-from typing import List
+from fastapi.responses import StreamingResponse
+from typing import List, Optional
+import json
 import logging
 
-from .services import PlayerService, MatchService
-from .dependencies import get_player_service, get_match_service, get_logger
-from .exceptions import RiotApiException, AccountNotFoundException, RateLimitException, ApiKeyException
-from .models import ApiResponse, RiotAccount, SummonerInfo, LeagueEntry
+from .services import PlayerService, MatchService, LadderService, AnalyticsService
+from .dependencies import (
+    get_player_service,
+    get_match_service,
+    get_ladder_service,
+    get_analytics_service,
+    get_admission_controller,
+    get_consumer,
+    get_logger,
+    admit_upstream_calls,
+    admit_account,
+    admit_player,
+    admit_live_game,
+    admit_summoner,
+    admit_league_entries,
+    admit_match_history,
+    admit_match_details,
+    admit_match_stream,
+    admit_match_timeline
+)
+from .admission import AdmissionController
+from .export import ParquetUnavailableError
+from .exceptions import (
+    RiotApiException,
+    AccountNotFoundException,
+    RateLimitException,
+    ApiKeyException,
+    ActiveGameNotFoundException
+)
+from .models import ApiResponse, RiotAccount, SummonerInfo, LeagueEntry, BulkPlayerLookupRequest
 
 router = APIRouter()
 
 
-@router.get("/account/{summoner_name}/{tag_line}", response_model=ApiResponse)
+@router.get("/account/{summoner_name}/{tag_line}", response_model=ApiResponse, dependencies=[Depends(admit_account)])
 async def get_account_info(
     summoner_name: str, 
     tag_line: str,
@@ -43,11 +71,11 @@ async def get_account_info(
         raise HTTPException(status_code=500, detail="Internal server error")
 
 
-@router.get("/player/{summoner_name}/{tag_line}", response_model=ApiResponse)
+@router.get("/player/{summoner_name}/{tag_line}", response_model=ApiResponse, dependencies=[Depends(admit_player)])
 async def get_complete_player_info(
     summoner_name: str, 
     tag_line: str, 
-    region: str = Query(default="EUW", description="Region code (e.g., EUW, NA, KR)"),
+    region: str = Query(default="EUW", description="Region code (e.g., EUW, NA, KR) or AUTO to detect it"),
     player_service: PlayerService = Depends(get_player_service),
     logger: logging.Logger = Depends(get_logger)
 ):
@@ -72,7 +100,79 @@ async def get_complete_player_info(
         raise HTTPException(status_code=500, detail="Internal server error")
 
 
-@router.get("/summoner/puuid/{puuid}", response_model=ApiResponse)
+@router.get("/live-game/{summoner_name}/{tag_line}", response_model=ApiResponse, dependencies=[Depends(admit_live_game)])
+async def get_live_game(
+    summoner_name: str,
+    tag_line: str,
+    region: str = Query(default="EUW", description="Region code (e.g., EUW, NA, KR) or AUTO to detect it"),
+    player_service: PlayerService = Depends(get_player_service),
+    logger: logging.Logger = Depends(get_logger)
+):
+    """Retrieves the player's current game with the rankings of every participant"""
+    try:
+        live_game = await player_service.get_live_game(summoner_name, tag_line, region)
+        return ApiResponse(success=True, data=live_game)
+    except ActiveGameNotFoundException as e:
+        logger.info(f"No active game for: {summoner_name}#{tag_line}")
+        raise HTTPException(status_code=404, detail=str(e))
+    except AccountNotFoundException as e:
+        logger.warning(f"Player not found: {summoner_name}#{tag_line}")
+        raise HTTPException(status_code=404, detail=str(e))
+    except ApiKeyException as e:
+        logger.error("API key invalid or expired")
+        raise HTTPException(status_code=403, detail=str(e))
+    except RateLimitException as e:
+        logger.warning("Rate limit exceeded")
+        raise HTTPException(status_code=429, detail=str(e))
+    except RiotApiException as e:
+        logger.error(f"Riot API error: {str(e)}")
+        raise HTTPException(status_code=e.status_code or 500, detail=str(e))
+    except Exception as e:
+        logger.error(f"Unexpected error in get_live_game: {str(e)}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
+@router.post("/players/bulk", response_model=ApiResponse)
+async def get_bulk_player_info(
+    request: BulkPlayerLookupRequest,
+    player_service: PlayerService = Depends(get_player_service),
+    admission_controller: AdmissionController = Depends(get_admission_controller),
+    consumer: str = Depends(get_consumer),
+    logger: logging.Logger = Depends(get_logger)
+):
+    """Retrieves complete player information for up to 50 Riot IDs in one call"""
+    # Results are returned at once, so every call must be sent within the admission deadline
+    admit_upstream_calls(admission_controller, admission_controller.estimate_players(request.players), consumer)
+    try:
+        results = await player_service.get_bulk_player_info(request.players)
+        return ApiResponse(success=True, data={
+            "requested": len(request.players),
+            "unique": len(results),
+            "results": results
+        })
+    except Exception as e:
+        logger.error(f"Unexpected error in get_bulk_player_info: {str(e)}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
+@router.get("/search/suggest", response_model=ApiResponse)
+async def suggest_riot_ids(
+    q: str = Query(..., description="Beginning of a Riot ID (e.g., fak or faker#t)"),
+    limit: int = Query(default=10, description="Maximum number of suggestions", ge=1, le=50),
+    player_service: PlayerService = Depends(get_player_service),
+    logger: logging.Logger = Depends(get_logger)
+):
+    """Suggests known Riot IDs starting with the query, without calling the Riot API"""
+    try:
+        return ApiResponse(success=True, data=player_service.suggest_riot_ids(q, limit))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Unexpected error in suggest_riot_ids: {str(e)}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
+@router.get("/summoner/puuid/{puuid}", response_model=ApiResponse, dependencies=[Depends(admit_summoner)])
 async def get_summoner_by_puuid(
     puuid: str, 
     region: str = Query(default="EUW", description="Region code (e.g., EUW, NA, KR)"),
@@ -91,7 +191,7 @@ async def get_summoner_by_puuid(
         raise HTTPException(status_code=500, detail="Internal server error")
 
 
-@router.get("/rankings/{summoner_id}", response_model=ApiResponse)
+@router.get("/rankings/{summoner_id}", response_model=ApiResponse, dependencies=[Depends(admit_league_entries)])
 async def get_league_entries(
     summoner_id: str, 
     region: str = Query(default="EUW", description="Region code (e.g., EUW, NA, KR)"),
@@ -110,7 +210,7 @@ async def get_league_entries(
         raise HTTPException(status_code=500, detail="Internal server error")
 
 
-@router.get("/matches/by-puuid/{puuid}/ids", response_model=ApiResponse)
+@router.get("/matches/by-puuid/{puuid}/ids", response_model=ApiResponse, dependencies=[Depends(admit_match_history)])
 async def get_match_history(
     puuid: str,
     region: str = Query(default="EUW", description="Region code (e.g., EUW, NA, KR)"),
@@ -131,7 +231,48 @@ async def get_match_history(
         raise HTTPException(status_code=500, detail="Internal server error")
 
 
-@router.get("/matches/{match_id}", response_model=ApiResponse)
+@router.get("/matches/stream", dependencies=[Depends(admit_match_stream)])
+async def stream_match_details(
+    puuid: Optional[str] = Query(default=None, description="Player PUUID whose match history should be streamed"),
+    ids: Optional[List[str]] = Query(default=None, description="Explicit list of match IDs to stream"),
+    region: str = Query(default="EUW", description="Region code (e.g., EUW, NA, KR)"),
+    start: int = Query(default=0, description="Start index (with puuid)", ge=0),
+    count: int = Query(default=20, description="Number of matches to stream (with puuid)", ge=1, le=100),
+    format: str = Query(default="ndjson", description="Stream format: ndjson or sse", pattern="^(ndjson|sse)$"),
+    match_service: MatchService = Depends(get_match_service),
+    logger: logging.Logger = Depends(get_logger)
+):
+    """Streams match details one by one as they become available (cached first)"""
+    if not puuid and not ids:
+        raise HTTPException(status_code=400, detail="Either puuid or ids must be provided")
+    
+    try:
+        match_ids = ids or await match_service.get_match_history(puuid, region, start, count)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except RiotApiException as e:
+        logger.error(f"Riot API error: {str(e)}")
+        raise HTTPException(status_code=e.status_code or 500, detail=str(e))
+    
+    async def encode_events():
+        async for item in match_service.stream_match_details(match_ids, region):
+            payload = json.dumps(item, separators=(",", ":"))
+            if format == "sse":
+                yield f"event: match\ndata: {payload}\n\n"
+            else:
+                yield payload + "\n"
+        if format == "sse":
+            yield "event: end\ndata: {}\n\n"
+    
+    media_type = "text/event-stream" if format == "sse" else "application/x-ndjson"
+    return StreamingResponse(
+        encode_events(),
+        media_type=media_type,
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@router.get("/matches/{match_id}", response_model=ApiResponse, dependencies=[Depends(admit_match_details)])
 async def get_match_details(
     match_id: str,
     region: str = Query(default="EUW", description="Region code (e.g., EUW, NA, KR)"),
@@ -148,3 +289,177 @@ async def get_match_details(
     except Exception as e:
         logger.error(f"Unexpected error in get_match_details: {str(e)}")
         raise HTTPException(status_code=500, detail="Internal server error")
+
+
+@router.get("/history/{puuid}", response_model=ApiResponse)
+async def get_local_match_history(
+    puuid: str,
+    champion: Optional[str] = Query(default=None, description="Champion ID or name (e.g., 103 or Ahri)"),
+    queue: Optional[int] = Query(default=None, description="Queue ID (e.g., 420 for ranked solo)"),
+    with_puuid: Optional[str] = Query(default=None, description="Only games played on the same team as this PUUID"),
+    start_time: Optional[int] = Query(default=None, description="Only games created at or after this epoch time (ms)"),
+    end_time: Optional[int] = Query(default=None, description="Only games created before this epoch time (ms)"),
+    start: int = Query(default=0, description="Start index", ge=0),
+    count: int = Query(default=20, description="Number of matches to return", ge=1, le=100),
+    details: bool = Query(default=False, description="Include the full match data"),
+    match_service: MatchService = Depends(get_match_service),
+    logger: logging.Logger = Depends(get_logger)
+):
+    """Retrieves a filtered match history from stored matches only (no Riot API call)"""
+    try:
+        history = await match_service.get_local_match_history(
+            puuid, champion, queue, with_puuid, start_time, end_time, start, count, details
+        )
+        return ApiResponse(success=True, data=history)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except LookupError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except Exception as e:
+        logger.error(f"Unexpected error in get_local_match_history: {str(e)}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
+@router.get("/export/matches")
+async def export_matches(
+    format: str = Query(default="ndjson", description="Export format: ndjson or parquet"),
+    level: str = Query(default="match", description="match (raw documents) or participant (one flat row per player)"),
+    puuid: Optional[str] = Query(default=None, description="Only matches this player took part in"),
+    start_time: Optional[int] = Query(default=None, description="Only games created at or after this epoch time (ms)"),
+    end_time: Optional[int] = Query(default=None, description="Only games created before this epoch time (ms)"),
+    queue: Optional[int] = Query(default=None, description="Queue ID (e.g., 420 for ranked solo)"),
+    patch: Optional[str] = Query(default=None, description="Patch (e.g., 14.24)"),
+    match_service: MatchService = Depends(get_match_service),
+    logger: logging.Logger = Depends(get_logger)
+):
+    """Streams stored matches as NDJSON or Parquet (never calls the Riot API)"""
+    try:
+        content = match_service.export_matches(format, level, puuid, start_time, end_time, queue, patch)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except ParquetUnavailableError as e:
+        raise HTTPException(status_code=501, detail=str(e))
+    except LookupError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    
+    if format == "parquet":
+        media_type, extension = "application/vnd.apache.parquet", "parquet"
+    else:
+        media_type, extension = "application/x-ndjson", "ndjson"
+    return StreamingResponse(
+        content,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="matches.{extension}"'}
+    )
+
+
+@router.get("/matches/{match_id}/timeline", response_model=ApiResponse, dependencies=[Depends(admit_match_timeline)])
+async def get_match_timeline(
+    match_id: str,
+    region: str = Query(default="EUW", description="Region code (e.g., EUW, NA, KR)"),
+    match_service: MatchService = Depends(get_match_service),
+    logger: logging.Logger = Depends(get_logger)
+):
+    """Retrieves gold/XP curves, per-minute player stats and key events of a match"""
+    try:
+        timeline = await match_service.get_match_timeline(match_id, region)
+        return ApiResponse(success=True, data=timeline)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except RiotApiException as e:
+        logger.error(f"Riot API error: {str(e)}")
+        raise HTTPException(status_code=e.status_code or 500, detail=str(e))
+    except Exception as e:
+        logger.error(f"Unexpected error in get_match_timeline: {str(e)}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
+@router.get("/leaderboard/{region}", response_model=ApiResponse)
+async def get_leaderboard(
+    region: str,
+    queue: str = Query(default="RANKED_SOLO_5x5", description="Queue type (RANKED_SOLO_5x5 or RANKED_FLEX_SR)"),
+    start: int = Query(default=0, description="Start position", ge=0),
+    count: int = Query(default=50, description="Number of players to return", ge=1, le=200),
+    ladder_service: LadderService = Depends(get_ladder_service),
+    logger: logging.Logger = Depends(get_logger)
+):
+    """Retrieves a page of the master+ leaderboard from the local ladder index"""
+    try:
+        leaderboard = ladder_service.get_leaderboard(region, queue, start, count)
+        return ApiResponse(success=True, data=leaderboard)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except LookupError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except Exception as e:
+        logger.error(f"Unexpected error in get_leaderboard: {str(e)}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
+@router.get("/leaderboard/{region}/percentile", response_model=ApiResponse)
+async def get_rank_percentile(
+    region: str,
+    tier: str = Query(description="Tier (e.g., GOLD, MASTER)"),
+    rank: str = Query(default="I", description="Division (e.g., IV, III, II, I)"),
+    lp: int = Query(default=0, description="League points", ge=0),
+    queue: str = Query(default="RANKED_SOLO_5x5", description="Queue type (RANKED_SOLO_5x5 or RANKED_FLEX_SR)"),
+    ladder_service: LadderService = Depends(get_ladder_service),
+    logger: logging.Logger = Depends(get_logger)
+):
+    """Retrieves the "top X%" position of a rank from the local ladder index"""
+    try:
+        percentile = ladder_service.get_percentile(region, queue, tier, rank, lp)
+        return ApiResponse(success=True, data=percentile)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except LookupError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except Exception as e:
+        logger.error(f"Unexpected error in get_rank_percentile: {str(e)}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
+@router.get("/analytics/champions/{champion_id}", response_model=ApiResponse)
+async def get_champion_pairs(
+    champion_id: int,
+    kind: str = Query(default="matchup", description="matchup (same lane, enemy team) or synergy (same team)"),
+    patch: Optional[str] = Query(default=None, description="Patch (e.g., 14.24)"),
+    queue: Optional[int] = Query(default=None, description="Queue ID (e.g., 420 for ranked solo)"),
+    role: Optional[str] = Query(default=None, description="Role (TOP, JUNGLE, MIDDLE, BOTTOM, UTILITY)"),
+    limit: int = Query(default=10, description="Number of champions to return", ge=1, le=100),
+    min_games: int = Query(default=10, description="Minimum number of games for a pair", ge=1),
+    order: str = Query(default="best", description="best or worst win rates first"),
+    analytics_service: AnalyticsService = Depends(get_analytics_service),
+    logger: logging.Logger = Depends(get_logger)
+):
+    """Retrieves a champion's top matchups or duos from the stored matches"""
+    try:
+        pairs = analytics_service.get_champion_pairs(champion_id, kind, patch, queue, role, limit, min_games, order)
+        return ApiResponse(success=True, data=pairs)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Unexpected error in get_champion_pairs: {str(e)}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
+@router.get("/quota/usage", response_model=ApiResponse)
+async def get_quota_usage(
+    admission_controller: AdmissionController = Depends(get_admission_controller),
+    consumer: str = Depends(get_consumer),
+    logger: logging.Logger = Depends(get_logger)
+):
+    """Retrieves the caller's Riot API usage over the current rate-limit window"""
+    quota = admission_controller.consumer_quota
+    if quota is None:
+        raise HTTPException(status_code=404, detail="Consumer quotas are disabled")
+    try:
+        return ApiResponse(success=True, data={
+            "budget": quota.budget,
+            "window": quota.window,
+            "maxShare": quota.max_share,
+            **quota.usage(consumer)
+        })
+    except Exception as e:
+        logger.error(f"Unexpected error in get_quota_usage: {str(e)}")
+        raise HTTPException(status_code=500, detail="Internal server error")
@@ -0,0 +1,170 @@
+"""
+Riot ID search
+Prefix index of every Riot ID seen in account lookups, live games and matches
+"""
+from bisect import bisect_left, insort
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import threading
+import time
+
+
+def normalize_riot_id(game_name: str, tag_line: str = "") -> str:
+    """Returns the case-insensitive index key of a Riot ID (e.g., "faker#t1")"""
+    key = game_name.strip().lower()
+    return f"{key}#{tag_line.strip().lower()}" if tag_line else key
+
+
+def _now_ms() -> int:
+    return int(time.time() * 1000)
+
+
+class RiotIdIndex:
+    """
+    Sorted array of normalized Riot IDs answering prefix queries with two bisections
+
+    Every entry remembers when its Riot ID was seen (game creation time for
+    matches, lookup time for accounts). An entry is only replaced by a newer
+    sighting, so older match history pages cannot bring back a previous name.
+    """
+
+    def __init__(self):
+        self._keys: List[str] = []
+        # key -> (game name, tag line, puuid, seen at in epoch milliseconds)
+        self._entries: Dict[str, Tuple[str, str, str, int]] = {}
+        self._key_by_puuid: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def add(self, puuid: str, game_name: Optional[str], tag_line: Optional[str], seen_at: Optional[int] = None) -> None:
+        """
+        Records the Riot ID a player had at a given time
+
+        Args:
+            puuid: Player PUUID
+            game_name: Riot ID game name (e.g., "Faker")
+            tag_line: Riot ID tag line (e.g., "T1")
+            seen_at: Epoch time (milliseconds) the Riot ID was seen, None for now
+        """
+        if not (puuid and game_name and tag_line):
+            return
+        with self._lock:
+            removed_key, is_new_key = self._assign(puuid, game_name, tag_line, seen_at or _now_ms())
+            if removed_key is not None:
+                del self._keys[bisect_left(self._keys, removed_key)]
+            if is_new_key:
+                insort(self._keys, normalize_riot_id(game_name, tag_line))
+
+    def _assign(self, puuid: str, game_name: str, tag_line: str, seen_at: int) -> Tuple[Optional[str], bool]:
+        """
+        Points the Riot ID at the player unless a newer sighting says otherwise,
+        without touching the sorted keys
+
+        Returns:
+            Tuple: The player's previous key if it must be dropped, and whether the key is new
+        """
+        key = normalize_riot_id(game_name, tag_line)
+        previous_key = self._key_by_puuid.get(puuid)
+        if previous_key is not None and self._entries[previous_key][3] > seen_at:
+            return None, False
+        previous_owner = self._entries.get(key)
+        if previous_owner is not None and previous_owner[2] != puuid and previous_owner[3] > seen_at:
+            return None, False
+
+        removed_key = None
+        if previous_key is not None and previous_key != key:
+            del self._entries[previous_key]
+            removed_key = previous_key
+        # The Riot ID now belongs to this player
+        if previous_owner is not None and previous_owner[2] != puuid:
+            del self._key_by_puuid[previous_owner[2]]
+        self._entries[key] = (game_name, tag_line, puuid, seen_at)
+        self._key_by_puuid[puuid] = key
+        return removed_key, previous_owner is None
+
+    def remove(self, game_name: str, tag_line: str) -> None:
+        """Forgets a Riot ID, e.g. once Riot reports that it no longer exists"""
+        key = normalize_riot_id(game_name, tag_line)
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is None:
+                return
+            del self._key_by_puuid[entry[2]]
+            del self._keys[bisect_left(self._keys, key)]
+
+    def add_match(self, match: Dict[str, Any]) -> None:
+        """Records the Riot IDs of every participant of a match-v5 document"""
+        info = match.get("info", {})
+        seen_at = info.get("gameCreation")
+        for participant in info.get("participants", []):
+            self.add(
+                participant.get("puuid"), participant.get("riotIdGameName"), participant.get("riotIdTagline"), seen_at
+            )
+
+    def add_active_game(self, game: Dict[str, Any]) -> None:
+        """Records the Riot IDs of every participant of a spectator-v5 game"""
+        for participant in game.get("participants", []):
+            riot_id = participant.get("riotId") or ""
+            if "#" in riot_id:
+                game_name, tag_line = riot_id.rsplit("#", 1)
+                self.add(participant.get("puuid"), game_name, tag_line)
+
+    def load(self, riot_ids: Iterable[Tuple[str, str, str, int]]) -> int:
+        """
+        Adds (puuid, game name, tag line, seen at) tuples in bulk, in any order
+
+        The tuples are indexed apart and merged at the end, so lookups are not
+        blocked while they are read. The newest sighting of each Riot ID wins.
+
+        Returns:
+            int: Number of Riot IDs in the index
+        """
+        loaded = RiotIdIndex()
+        for puuid, game_name, tag_line, seen_at in riot_ids:
+            if puuid and game_name and tag_line:
+                loaded._assign(puuid, game_name, tag_line, seen_at)
+
+        with self._lock:
+            for game_name, tag_line, puuid, seen_at in loaded._entries.values():
+                self._assign(puuid, game_name, tag_line, seen_at)
+            # One sort instead of an insertion per Riot ID
+            self._keys = sorted(self._entries)
+            return len(self._keys)
+
+    def get(self, game_name: str, tag_line: str, max_age: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """
+        Returns the account with exactly this Riot ID, or None if unknown
+
+        Args:
+            game_name: Riot ID game name
+            tag_line: Riot ID tag line
+            max_age: Ignore sightings older than this many seconds, None to accept any
+        """
+        with self._lock:
+            entry = self._entries.get(normalize_riot_id(game_name, tag_line))
+        if entry is None:
+            return None
+        if max_age is not None and entry[3] < _now_ms() - max_age * 1000:
+            return None
+        return {"gameName": entry[0], "tagLine": entry[1], "puuid": entry[2], "seenAt": entry[3]}
+
+    def suggest(self, query: str, limit: int = 10) -> List[Dict[str, str]]:
+        """
+        Returns the Riot IDs starting with the query, in alphabetical order
+
+        Args:
+            query: Beginning of a Riot ID ("fak", "faker#t", ...)
+            limit: Maximum number of suggestions
+        """
+        prefix = query.strip().lower()
+        if not prefix:
+            return []
+
+        with self._lock:
+            start = bisect_left(self._keys, prefix)
+            # U+FFFF sorts after every character a Riot ID can contain
+            end = bisect_left(self._keys, prefix + "\uffff", lo=start)
+            entries = [self._entries[key] for key in self._keys[start:min(end, start + limit)]]
+
+        return [{"gameName": game_name, "tagLine": tag_line, "puuid": puuid} for game_name, tag_line, puuid, _ in entries]
+
+    def __len__(self) -> int:
+        return len(self._keys)
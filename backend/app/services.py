@@ -2,22 +2,63 @@
 Service layer for player-related business logic
 Separates business logic from route handlers
 """
-from typing import List, Optional
+from typing import List, Optional, AsyncIterator, Iterator, Set
+from array import array
+import asyncio
+import logging
+import os
 from pydantic import Field, validator
-from .api import riot_client
-from .models import RiotAccount, SummonerInfo, LeagueEntry
+from .api import RiotApiClient, AUTO_REGION
+from .models import RiotAccount, SummonerInfo, LeagueEntry, PlayerLookup
 from .exceptions import AccountNotFoundException, RiotApiException
+from .ladder import LadderIndex, TIERS, APEX_TIERS, DIVISIONS, rank_score
+from .storage import MatchStore
+from .analytics import ChampionStats, MATCHUP, SYNERGY
+from .export import iter_ndjson, iter_parquet, iter_participant_rows, parquet_available, ParquetUnavailableError
+
+
+logger = logging.getLogger(__name__)
+
+
+class PrefetchPolicy:
+    """Settings for speculative match prefetching after a player lookup"""
+    
+    def __init__(self, match_count: int = 0, min_headroom: int = 20):
+        # Number of recent matches to warm (0 disables prefetching)
+        self.match_count = match_count
+        # Rate-limit budget always kept free for user-initiated requests
+        self.min_headroom = min_headroom
+    
+    @classmethod
+    def from_env(cls) -> "PrefetchPolicy":
+        """Builds the policy from PREFETCH_MATCH_COUNT and PREFETCH_MIN_HEADROOM"""
+        return cls(
+            match_count=int(os.getenv("PREFETCH_MATCH_COUNT", "0")),
+            min_headroom=int(os.getenv("PREFETCH_MIN_HEADROOM", "20")),
+        )
+    
+    @property
+    def enabled(self) -> bool:
+        return self.match_count > 0
+
+
+# Maximum number of player lookups of a bulk request running at the same time
+BULK_LOOKUP_CONCURRENCY = 10
 
 
 class PlayerService:
     """Service class for player-related operations"""
     
+    def __init__(self, riot_client: RiotApiClient, match_service: "MatchService", ladder_index: Optional[LadderIndex] = None):
+        self.riot_client = riot_client
+        self.match_service = match_service
+        self.ladder_index = ladder_index
+    
     @staticmethod
-    async def get_account_info(summoner_name: str, tag_line: str, region: str) -> RiotAccount:
+    def _validate_riot_id(summoner_name: str, tag_line: str) -> None:
         """
-        Business logic for retrieving account information
+        Input validation shared by every Riot ID lookup
         """
-        # Input validation
         if not summoner_name.strip():
             raise ValueError("Summoner name cannot be empty")
         if not tag_line.strip():
@@ -26,29 +67,114 @@ class PlayerService:
             raise ValueError("Summoner name too long (max 16 characters)")
         if len(tag_line) > 5:
             raise ValueError("Tag line too long (max 5 characters)")
+    
+    async def get_account_info(self, summoner_name: str, tag_line: str, region: str) -> RiotAccount:
+        """
+        Business logic for retrieving account information
+        """
+        self._validate_riot_id(summoner_name, tag_line)
         
-        return await riot_client.get_account_by_riot_id(summoner_name.strip(), tag_line.strip(), region.upper())
+        return await self.riot_client.get_account_by_riot_id(summoner_name.strip(), tag_line.strip(), region.upper())
     
-    @staticmethod
-    async def get_complete_player_info(summoner_name: str, tag_line: str, region: str) -> dict:
+    def suggest_riot_ids(self, query: str, limit: int = 10) -> List[dict]:
+        """
+        Business logic for Riot ID autocompletion
+        Only searches Riot IDs already seen locally, never calls the Riot API
+        """
+        if not query.strip():
+            raise ValueError("Search query cannot be empty")
+        
+        return self.riot_client.riot_id_index.suggest(query, limit)
+    
+    async def get_complete_player_info(self, summoner_name: str, tag_line: str, region: str) -> dict:
         """
         Business logic for retrieving complete player information
         Aggregates data from multiple API calls
         """
-        # Input validation (same as above)
-        if not summoner_name.strip():
-            raise ValueError("Summoner name cannot be empty")
-        if not tag_line.strip():
-            raise ValueError("Tag line cannot be empty")
-        if len(summoner_name) > 16:
-            raise ValueError("Summoner name too long (max 16 characters)")
-        if len(tag_line) > 5:
-            raise ValueError("Tag line too long (max 5 characters)")
+        self._validate_riot_id(summoner_name, tag_line)
+        
+        player_info = await self.riot_client.get_complete_player_info(summoner_name.strip(), tag_line.strip(), region.upper())
         
-        return await riot_client.get_complete_player_info(summoner_name.strip(), tag_line.strip(), region.upper())
+        if self.match_service.prefetch_policy.enabled:
+            self.match_service.schedule_prefetch(player_info["account"]["puuid"], player_info["region"])
+        
+        if self.ladder_index is not None:
+            for entry in player_info["rankings"]:
+                entry["percentile"] = self.ladder_index.percentile(
+                    player_info["region"], entry["queueType"], entry["tier"], entry["rank"], entry["leaguePoints"]
+                )
+        
+        return player_info
     
-    @staticmethod
-    async def get_summoner_by_puuid(puuid: str, region: str) -> SummonerInfo:
+    async def get_bulk_player_info(self, lookups: List[PlayerLookup]) -> List[dict]:
+        """
+        Business logic for looking up many players at once
+        Deduplicates Riot IDs and runs the lookups concurrently, reporting errors per entry
+        """
+        unique_lookups = {}
+        for lookup in lookups:
+            key = (lookup.gameName.strip().lower(), lookup.tagLine.strip().lower(), lookup.region.upper())
+            unique_lookups.setdefault(key, lookup)
+        
+        semaphore = asyncio.Semaphore(BULK_LOOKUP_CONCURRENCY)
+        
+        async def lookup_player(lookup: PlayerLookup) -> dict:
+            result = {"gameName": lookup.gameName, "tagLine": lookup.tagLine, "region": lookup.region.upper()}
+            try:
+                self._validate_riot_id(lookup.gameName, lookup.tagLine)
+                if lookup.region.upper() != AUTO_REGION:
+                    self.riot_client.get_platform_base_url(lookup.region.upper())
+                async with semaphore:
+                    data = await self.riot_client.get_complete_player_info(
+                        lookup.gameName.strip(), lookup.tagLine.strip(), lookup.region.upper()
+                    )
+                result.update(success=True, data=data)
+            except ValueError as e:
+                result.update(success=False, error=str(e), status_code=400)
+            except RiotApiException as e:
+                result.update(success=False, error=e.message, status_code=e.status_code or 500)
+            return result
+        
+        return await asyncio.gather(*(lookup_player(lookup) for lookup in unique_lookups.values()))
+    
+    async def get_live_game(self, summoner_name: str, tag_line: str, region: str) -> dict:
+        """
+        Business logic for scouting a player's current game
+        Fans out the league entry lookups of every participant concurrently
+        """
+        self._validate_riot_id(summoner_name, tag_line)
+        region = region.upper()
+        
+        account = await self.riot_client.get_account_by_riot_id(summoner_name.strip(), tag_line.strip(), region)
+        if region == AUTO_REGION:
+            region = await self.riot_client.get_player_region(account.puuid)
+        game = await self.riot_client.get_active_game(account.puuid, region)
+        
+        async def participant_with_rankings(participant: dict) -> dict:
+            result = dict(participant)
+            if not participant.get("puuid"):
+                # Bots and hidden players have no rankings
+                result["rankings"] = []
+                return result
+            try:
+                entries = await self.riot_client.get_league_entries(participant["puuid"], region)
+                result["rankings"] = [entry.dict() for entry in entries]
+            except RiotApiException as e:
+                result["rankings"] = None
+                result["rankingsError"] = e.message
+            return result
+        
+        participants = await asyncio.gather(
+            *(participant_with_rankings(participant) for participant in game.get("participants", []))
+        )
+        
+        return {
+            **{key: value for key, value in game.items() if key != "participants"},
+            "region": region,
+            "participants": participants
+        }
+    
+    async def get_summoner_by_puuid(self, puuid: str, region: str) -> SummonerInfo:
         """
         Business logic for retrieving summoner by PUUID
         """
@@ -56,24 +182,36 @@ class PlayerService:
         if not puuid or len(puuid) != 78:
             raise ValueError("Invalid PUUID format")
         
-        return await riot_client.get_summoner_by_puuid(puuid, region.upper())
+        return await self.riot_client.get_summoner_by_puuid(puuid, region.upper())
     
-    @staticmethod
-    async def get_league_entries(summoner_id: str, region: str) -> List[LeagueEntry]:
+    async def get_league_entries(self, summoner_id: str, region: str) -> List[LeagueEntry]:
         """
         Business logic for retrieving league entries
         """
         if not summoner_id.strip():
             raise ValueError("Summoner ID cannot be empty")
         
-        return await riot_client.get_league_entries(summoner_id.strip(), region.upper())
+        return await self.riot_client.get_league_entries(summoner_id.strip(), region.upper())
 
 
 class MatchService:
     """Service class for match-related operations"""
     
-    @staticmethod
-    async def get_match_history(puuid: str, region: str, start: int = 0, count: int = 20) -> List[str]:
+    def __init__(
+        self,
+        riot_client: RiotApiClient,
+        prefetch_policy: Optional[PrefetchPolicy] = None,
+        match_store: Optional[MatchStore] = None,
+        champion_stats: Optional[ChampionStats] = None
+    ):
+        self.riot_client = riot_client
+        self.prefetch_policy = prefetch_policy or PrefetchPolicy()
+        self.match_store = match_store
+        self.champion_stats = champion_stats
+        # Strong references to running prefetch tasks so they are not garbage collected
+        self._prefetch_tasks: Set[asyncio.Task] = set()
+    
+    async def get_match_history(self, puuid: str, region: str, start: int = 0, count: int = 20) -> List[str]:
         """
         Business logic for retrieving match history
         Applies business rules like count validation
@@ -86,10 +224,9 @@ class MatchService:
         if count < 1 or count > 100:
             raise ValueError("Count must be between 1 and 100")
         
-        return await riot_client.get_match_history(puuid, region.upper(), start, count)
+        return await self.riot_client.get_match_history(puuid, region.upper(), start, count)
     
-    @staticmethod
-    async def get_match_details(match_id: str, region: str) -> dict:
+    async def get_match_details(self, match_id: str, region: str) -> dict:
         """
         Business logic for retrieving match details
         """
@@ -98,4 +235,382 @@ class MatchService:
         if not match_id.startswith(region.upper()):
             raise ValueError(f"Match ID must start with {region.upper()}")
         
-        return await riot_client.get_match_details(match_id.strip(), region.upper())
+        match_id = match_id.strip()
+        stored = await self.get_local_match_details(match_id)
+        if stored is not None:
+            return stored
+        
+        match = await self.riot_client.get_match_details(match_id, region.upper())
+        # SQLite writes block, keep them off the event loop
+        await asyncio.to_thread(self._store_match, match)
+        return match
+    
+    async def get_local_match_history(
+        self,
+        puuid: str,
+        champion: Optional[str] = None,
+        queue_id: Optional[int] = None,
+        with_puuid: Optional[str] = None,
+        start_time: Optional[int] = None,
+        end_time: Optional[int] = None,
+        start: int = 0,
+        count: int = 20,
+        include_details: bool = False
+    ) -> dict:
+        """
+        Business logic for filtered match history served only from stored matches
+        """
+        if not puuid or len(puuid) != 78:
+            raise ValueError("Invalid PUUID format")
+        if with_puuid is not None and len(with_puuid) != 78:
+            raise ValueError("Invalid teammate PUUID format")
+        if start < 0:
+            raise ValueError("Start index must be non-negative")
+        if count < 1 or count > 100:
+            raise ValueError("Count must be between 1 and 100")
+        if self.match_store is None:
+            raise LookupError("Local match storage is not enabled")
+        
+        match_ids = await asyncio.to_thread(
+            self.match_store.query_history, puuid, champion, queue_id, with_puuid, start_time, end_time, start, count
+        )
+        history = {"puuid": puuid, "start": start, "count": len(match_ids), "matchIds": match_ids}
+        if include_details:
+            history["matches"] = await asyncio.to_thread(
+                lambda: [self.match_store.get(match_id) for match_id in match_ids]
+            )
+        return history
+    
+    def export_matches(
+        self,
+        export_format: str = "ndjson",
+        level: str = "match",
+        puuid: Optional[str] = None,
+        start_time: Optional[int] = None,
+        end_time: Optional[int] = None,
+        queue_id: Optional[int] = None,
+        patch: Optional[str] = None
+    ) -> Iterator[bytes]:
+        """
+        Business logic for exporting stored matches, without any Riot API call
+        Returns a lazy byte stream: whole matches or flattened participant rows
+        """
+        if export_format not in ("ndjson", "parquet"):
+            raise ValueError("Format must be 'ndjson' or 'parquet'")
+        if level not in ("match", "participant"):
+            raise ValueError("Level must be 'match' or 'participant'")
+        if export_format == "parquet" and level != "participant":
+            raise ValueError("Parquet export is only available at participant level")
+        if export_format == "parquet" and not parquet_available():
+            raise ParquetUnavailableError()
+        if self.match_store is None:
+            raise LookupError("Local match storage is not enabled")
+        
+        matches = self.match_store.iter_filtered(puuid, start_time, end_time, queue_id, patch)
+        records = iter_participant_rows(matches) if level == "participant" else matches
+        return iter_parquet(records) if export_format == "parquet" else iter_ndjson(records)
+    
+    async def get_local_match_details(self, match_id: str) -> Optional[dict]:
+        """
+        Returns a match from the client cache or the local store, without any upstream call
+        """
+        cached = self.riot_client.get_cached_match_details(match_id)
+        if cached is None and self.match_store is not None:
+            cached = await asyncio.to_thread(self.match_store.get, match_id)
+        return cached
+    
+    def has_local_match_details(self, match_id: str) -> bool:
+        """
+        Returns True if a match can be served without any upstream call, without loading it
+        """
+        if match_id in self.riot_client.match_cache:
+            return True
+        return self.match_store is not None and self.match_store.contains(match_id)
+    
+    def _store_match(self, match: dict) -> None:
+        """
+        Persists a newly fetched match and feeds it to the champion statistics
+        Blocking (SQLite write), call it through asyncio.to_thread
+        """
+        if self.match_store is None or "info" not in match:
+            return
+        if self.match_store.add(match) and self.champion_stats is not None:
+            self.champion_stats.ingest(match)
+    
+    async def get_match_timeline(self, match_id: str, region: str) -> dict:
+        """
+        Business logic for retrieving the derived timeline series of a match
+        """
+        if not match_id.strip():
+            raise ValueError("Match ID cannot be empty")
+        if not match_id.startswith(region.upper()):
+            raise ValueError(f"Match ID must start with {region.upper()}")
+        
+        return await self.riot_client.get_match_timeline(match_id.strip(), region.upper())
+    
+    async def stream_match_details(self, match_ids: List[str], region: str) -> AsyncIterator[dict]:
+        """
+        Business logic for streaming match details as soon as each one is available
+        Cached matches are yielded first, upstream fetches follow in completion order
+        """
+        region = region.upper()
+        unique_ids = list(dict.fromkeys(match_id.strip() for match_id in match_ids if match_id.strip()))
+        
+        pending = []
+        for match_id in unique_ids:
+            cached = await self.get_local_match_details(match_id)
+            if cached is not None:
+                yield {"matchId": match_id, "success": True, "data": cached}
+            else:
+                pending.append(match_id)
+        
+        async def fetch(match_id: str) -> dict:
+            try:
+                data = await self.get_match_details(match_id, region)
+                return {"matchId": match_id, "success": True, "data": data}
+            except ValueError as e:
+                return {"matchId": match_id, "success": False, "error": str(e), "status_code": 400}
+            except RiotApiException as e:
+                return {"matchId": match_id, "success": False, "error": e.message, "status_code": e.status_code or 500}
+        
+        tasks = [asyncio.create_task(fetch(match_id)) for match_id in pending]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            # Client disconnected or generator closed early: stop pending upstream calls
+            for task in tasks:
+                task.cancel()
+    
+    def schedule_prefetch(self, puuid: str, region: str) -> None:
+        """
+        Enqueues a background warm-up of the player's recent matches
+        Does nothing if the rate-limit budget is already tight
+        """
+        if self.riot_client.get_rate_limit_headroom() <= self.prefetch_policy.min_headroom:
+            logger.info(f"Skipping match prefetch for {puuid}: rate-limit headroom too low")
+            return
+        
+        task = asyncio.create_task(self.prefetch_recent_matches(puuid, region, self.prefetch_policy.match_count))
+        self._prefetch_tasks.add(task)
+        task.add_done_callback(self._prefetch_tasks.discard)
+    
+    async def prefetch_recent_matches(self, puuid: str, region: str, count: int) -> None:
+        """
+        Low-priority warm-up of the match ID list and match details caches
+        Fetches sequentially and stops as soon as the spare budget runs out
+        """
+        try:
+            # Same page the frontend requests first, so its history call is a cache hit
+            match_ids = await self.riot_client.get_match_history(puuid, region, 0, 20)
+            
+            warmed = 0
+            for match_id in match_ids[:count]:
+                if self.has_local_match_details(match_id):
+                    continue
+                if self.riot_client.get_rate_limit_headroom() <= self.prefetch_policy.min_headroom:
+                    logger.info(f"Match prefetch for {puuid} cancelled: rate-limit headroom too low")
+                    return
+                await self.get_match_details(match_id, region)
+                warmed += 1
+            
+            logger.info(f"Match prefetch for {puuid} completed: {warmed} matches warmed")
+        except (RiotApiException, ValueError) as e:
+            logger.warning(f"Match prefetch for {puuid} stopped: {str(e)}")
+    
+    async def cancel_prefetches(self) -> None:
+        """
+        Cancels every running prefetch task (used on shutdown)
+        """
+        tasks = list(self._prefetch_tasks)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+class LadderService:
+    """Service class for ranked ladder ingestion and local ladder queries"""
+    
+    QUEUES = ["RANKED_SOLO_5x5", "RANKED_FLEX_SR"]
+    
+    def __init__(
+        self,
+        riot_client: RiotApiClient,
+        ladder_index: LadderIndex,
+        regions: Optional[List[str]] = None,
+        max_pages: int = 0,
+        min_headroom: int = 20
+    ):
+        self.riot_client = riot_client
+        self.ladder_index = ladder_index
+        # Regions ingested by the scheduled job (empty disables it)
+        self.regions = regions or []
+        # Maximum pages per tier and division (0 means every page)
+        self.max_pages = max_pages
+        # Rate-limit budget always kept free for user-initiated requests
+        self.min_headroom = min_headroom
+    
+    async def _wait_for_headroom(self) -> None:
+        """Pauses ingestion while the spare rate-limit budget is exhausted"""
+        while self.riot_client.get_rate_limit_headroom() <= self.min_headroom:
+            await asyncio.sleep(5)
+    
+    async def ingest(self, region: str, queue: str) -> None:
+        """
+        Pages through the ladder of a queue (up to max_pages per division) and rebuilds its local index
+        """
+        scores = array("i")
+        apex_entries = []
+        truncated = False
+        
+        for tier in APEX_TIERS:
+            await self._wait_for_headroom()
+            league = await self.riot_client.get_apex_league(tier, queue, region)
+            for entry in league.get("entries", []):
+                scores.append(rank_score(tier, "I", entry["leaguePoints"]))
+                apex_entries.append({
+                    "puuid": entry.get("puuid"),
+                    "tier": tier,
+                    "leaguePoints": entry["leaguePoints"],
+                    "wins": entry["wins"],
+                    "losses": entry["losses"]
+                })
+        
+        for tier in TIERS:
+            if tier in APEX_TIERS:
+                continue
+            for division in DIVISIONS:
+                page = 1
+                while not self.max_pages or page <= self.max_pages:
+                    await self._wait_for_headroom()
+                    entries = await self.riot_client.get_league_exp_entries(queue, tier, division, page, region)
+                    if not entries:
+                        break
+                    scores.extend(rank_score(tier, division, entry["leaguePoints"]) for entry in entries)
+                    page += 1
+                else:
+                    # Stopped at the page limit with more players possibly left
+                    truncated = True
+        
+        if truncated:
+            logger.warning(f"Ladder of {region} {queue} truncated at {self.max_pages} pages, percentiles disabled")
+        self.ladder_index.replace(region, queue, scores, apex_entries, truncated)
+        logger.info(f"Ladder ingested for {region} {queue}: {len(scores)} players")
+    
+    async def run_periodically(self, interval: float) -> None:
+        """
+        Re-ingests every configured region and queue, then sleeps for the interval
+        """
+        while True:
+            for region in self.regions:
+                for queue in self.QUEUES:
+                    try:
+                        await self.ingest(region, queue)
+                    except RiotApiException as e:
+                        logger.warning(f"Ladder ingestion failed for {region} {queue}: {str(e)}")
+                    except Exception as e:
+                        # Keep the schedule alive for the other regions and the next run
+                        logger.error(f"Unexpected error in ladder ingestion for {region} {queue}: {str(e)}")
+            await asyncio.sleep(interval)
+    
+    def _validate_queue(self, queue: str) -> None:
+        if queue not in self.QUEUES:
+            raise ValueError(f"Unsupported queue: {queue}. Supported queues: {self.QUEUES}")
+    
+    def get_leaderboard(self, region: str, queue: str, start: int = 0, count: int = 50) -> dict:
+        """
+        Business logic for reading a leaderboard page from the local index
+        """
+        region = region.upper()
+        self._validate_queue(queue)
+        
+        entries = self.ladder_index.leaderboard(region, queue, start, count)
+        if entries is None:
+            raise LookupError(f"Ladder not available yet for {region} {queue}")
+        
+        return {"region": region, "queue": queue, **self.ladder_index.stats(region, queue), "entries": entries}
+    
+    def get_percentile(self, region: str, queue: str, tier: str, division: str, league_points: int) -> dict:
+        """
+        Business logic for computing a rank percentile from the local index
+        """
+        region = region.upper()
+        self._validate_queue(queue)
+        if tier.upper() not in TIERS:
+            raise ValueError(f"Unsupported tier: {tier}")
+        if tier.upper() not in APEX_TIERS and division.upper() not in DIVISIONS:
+            raise ValueError(f"Unsupported division: {division}")
+        
+        stats = self.ladder_index.stats(region, queue)
+        if stats is not None and stats["truncated"]:
+            raise LookupError(f"Ladder of {region} {queue} is truncated (LADDER_MAX_PAGES), percentiles are unavailable")
+        percentile = self.ladder_index.percentile(region, queue, tier, division, league_points)
+        if percentile is None:
+            raise LookupError(f"Ladder not available yet for {region} {queue}")
+        
+        return {
+            "region": region,
+            "queue": queue,
+            "tier": tier.upper(),
+            "rank": division.upper(),
+            "leaguePoints": league_points,
+            "percentile": percentile
+        }
+
+
+class AnalyticsService:
+    """Service class for champion statistics computed from the stored matches"""
+    
+    def __init__(self, champion_stats: ChampionStats, match_store: MatchStore):
+        self.champion_stats = champion_stats
+        self.match_store = match_store
+    
+    def rebuild(self) -> int:
+        """
+        Feeds every match already in the store to the champion statistics
+        Matches stored while rebuilding are ingested live and skipped here
+        """
+        ingested = 0
+        for match in self.match_store.iter_matches(up_to_rowid=self.match_store.last_rowid()):
+            self.champion_stats.ingest(match)
+            ingested += 1
+        logger.info(f"Champion statistics rebuilt from {ingested} stored matches")
+        return ingested
+    
+    def get_champion_pairs(
+        self,
+        champion_id: int,
+        kind: str,
+        patch: Optional[str] = None,
+        queue: Optional[int] = None,
+        role: Optional[str] = None,
+        limit: int = 10,
+        min_games: int = 10,
+        order: str = "best"
+    ) -> dict:
+        """
+        Business logic for retrieving a champion's best or worst matchups and duos
+        """
+        if kind not in (MATCHUP, SYNERGY):
+            raise ValueError(f"Unsupported kind: {kind}. Supported kinds: {[MATCHUP, SYNERGY]}")
+        if order not in ("best", "worst"):
+            raise ValueError("Order must be 'best' or 'worst'")
+        
+        result = self.champion_stats.top_pairs(
+            champion_id,
+            kind=kind,
+            patch=patch,
+            queue=queue,
+            role=role.upper() if role else None,
+            limit=limit,
+            min_games=min_games,
+            ascending=order == "worst"
+        )
+        return {
+            "championId": champion_id,
+            "kind": kind,
+            "patch": patch,
+            "queue": queue,
+            "role": role.upper() if role else None,
+            **result
+        }
@@ -0,0 +1,311 @@
+"""
+Local match storage
+Keeps every fetched match in a SQLite database so it never has to be fetched twice
+"""
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+import json
+import os
+import sqlite3
+import threading
+
+
+class MatchStore:
+    """SQLite-backed storage of raw match-v5 documents"""
+
+    def __init__(self, path: str = "data/matches.db"):
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+
+        with self._lock, self._connection:
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS matches (
+                    match_id TEXT PRIMARY KEY,
+                    game_creation INTEGER NOT NULL,
+                    queue_id INTEGER NOT NULL,
+                    game_version TEXT NOT NULL,
+                    data TEXT NOT NULL
+                )
+                """
+            )
+            # Secondary indexes: one row per participant, ordered lookups by player
+            self._connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS match_participants (
+                    match_id TEXT NOT NULL,
+                    puuid TEXT NOT NULL,
+                    champion_id INTEGER NOT NULL,
+                    champion_name TEXT NOT NULL COLLATE NOCASE,
+                    team_id INTEGER NOT NULL,
+                    win INTEGER NOT NULL,
+                    riot_id_game_name TEXT,
+                    riot_id_tagline TEXT,
+                    game_creation INTEGER NOT NULL,
+                    queue_id INTEGER NOT NULL,
+                    PRIMARY KEY (match_id, puuid)
+                )
+                """
+            )
+            self._connection.execute(
+                "CREATE INDEX IF NOT EXISTS idx_participants_puuid "
+                "ON match_participants (puuid, game_creation DESC)"
+            )
+            self._connection.execute(
+                "CREATE INDEX IF NOT EXISTS idx_participants_puuid_champion "
+                "ON match_participants (puuid, champion_id, game_creation DESC)"
+            )
+            self._connection.execute(
+                "CREATE INDEX IF NOT EXISTS idx_participants_puuid_queue "
+                "ON match_participants (puuid, queue_id, game_creation DESC)"
+            )
+
+        self._backfill_participants()
+
+    def _backfill_participants(self) -> None:
+        """Indexes matches stored before the participant table existed"""
+        with self._lock:
+            match_ids = [
+                row[0] for row in self._connection.execute(
+                    "SELECT match_id FROM matches WHERE match_id NOT IN (SELECT DISTINCT match_id FROM match_participants)"
+                )
+            ]
+        for match_id in match_ids:
+            match = self.get(match_id)
+            with self._lock, self._connection:
+                self._insert_participants(match)
+
+    def _insert_participants(self, match: Dict[str, Any]) -> None:
+        info = match["info"]
+        self._connection.executemany(
+            "INSERT OR IGNORE INTO match_participants (match_id, puuid, champion_id, champion_name, team_id, win, "
+            "riot_id_game_name, riot_id_tagline, game_creation, queue_id) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            [
+                (
+                    match["metadata"]["matchId"],
+                    participant["puuid"],
+                    participant.get("championId", 0),
+                    participant.get("championName", ""),
+                    participant.get("teamId", 0),
+                    int(bool(participant.get("win"))),
+                    participant.get("riotIdGameName"),
+                    participant.get("riotIdTagline"),
+                    info.get("gameCreation", 0),
+                    info.get("queueId", 0),
+                )
+                for participant in info.get("participants", [])
+                if participant.get("puuid")
+            ],
+        )
+
+    def add(self, match: Dict[str, Any]) -> bool:
+        """
+        Stores a match document
+
+        Args:
+            match: Complete match data as returned by match-v5
+
+        Returns:
+            bool: True if the match was new, False if it was already stored
+        """
+        info = match["info"]
+        with self._lock, self._connection:
+            cursor = self._connection.execute(
+                "INSERT OR IGNORE INTO matches (match_id, game_creation, queue_id, game_version, data) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (
+                    match["metadata"]["matchId"],
+                    info.get("gameCreation", 0),
+                    info.get("queueId", 0),
+                    info.get("gameVersion", ""),
+                    json.dumps(match, separators=(",", ":")),
+                ),
+            )
+            if cursor.rowcount != 1:
+                return False
+            self._insert_participants(match)
+            return True
+
+    def get(self, match_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Returns a stored match, or None if it is not stored
+        """
+        with self._lock:
+            row = self._connection.execute("SELECT data FROM matches WHERE match_id = ?", (match_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def contains(self, match_id: str) -> bool:
+        """
+        Returns True if a match is stored, without loading its document
+        """
+        with self._lock:
+            return self._connection.execute("SELECT 1 FROM matches WHERE match_id = ?", (match_id,)).fetchone() is not None
+
+    def iter_matches(self, up_to_rowid: Optional[int] = None, batch_size: int = 500) -> Iterator[Dict[str, Any]]:
+        """
+        Yields stored matches in insertion order, loading them in batches to keep memory bounded
+
+        Args:
+            up_to_rowid: Stop after this row (see last_rowid), None for every match
+            batch_size: Number of matches loaded per query
+        """
+        last_rowid = 0
+        limit_rowid = up_to_rowid if up_to_rowid is not None else 2 ** 63 - 1
+        while True:
+            with self._lock:
+                rows = self._connection.execute(
+                    "SELECT rowid, data FROM matches WHERE rowid > ? AND rowid <= ? ORDER BY rowid LIMIT ?",
+                    (last_rowid, limit_rowid, batch_size),
+                ).fetchall()
+            if not rows:
+                return
+            for rowid, data in rows:
+                last_rowid = rowid
+                yield json.loads(data)
+
+    def query_history(
+        self,
+        puuid: str,
+        champion: Optional[str] = None,
+        queue_id: Optional[int] = None,
+        with_puuid: Optional[str] = None,
+        start_time: Optional[int] = None,
+        end_time: Optional[int] = None,
+        start: int = 0,
+        count: int = 20,
+    ) -> List[str]:
+        """
+        Returns the stored match IDs of a player, most recent first, using the secondary indexes
+
+        Args:
+            puuid: Player PUUID
+            champion: Champion ID or name played by the player
+            queue_id: Queue ID (e.g., 420)
+            with_puuid: PUUID of a teammate who must have been on the player's team
+            start_time: Only games created at or after this epoch time (milliseconds)
+            end_time: Only games created before this epoch time (milliseconds)
+            start: Number of matches to skip
+            count: Number of matches to return
+
+        Returns:
+            List[str]: Match IDs sorted by gameCreation, newest first
+        """
+        query = "SELECT p.match_id FROM match_participants p"
+        params: List[Any] = []
+        if with_puuid:
+            query += " JOIN match_participants t ON t.match_id = p.match_id AND t.team_id = p.team_id AND t.puuid = ?"
+            params.append(with_puuid)
+
+        query += " WHERE p.puuid = ?"
+        params.append(puuid)
+        if champion:
+            if champion.isdigit():
+                query += " AND p.champion_id = ?"
+                params.append(int(champion))
+            else:
+                query += " AND p.champion_name = ?"
+                params.append(champion)
+        if queue_id is not None:
+            query += " AND p.queue_id = ?"
+            params.append(queue_id)
+        if start_time is not None:
+            query += " AND p.game_creation >= ?"
+            params.append(start_time)
+        if end_time is not None:
+            query += " AND p.game_creation < ?"
+            params.append(end_time)
+
+        query += " ORDER BY p.game_creation DESC LIMIT ? OFFSET ?"
+        params.extend([count, start])
+
+        with self._lock:
+            return [row[0] for row in self._connection.execute(query, params)]
+
+    def iter_filtered(
+        self,
+        puuid: Optional[str] = None,
+        start_time: Optional[int] = None,
+        end_time: Optional[int] = None,
+        queue_id: Optional[int] = None,
+        patch: Optional[str] = None,
+        batch_size: int = 200,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Yields the stored matches matching every given filter, in insertion order
+
+        Matches are read in batches by row ID, so memory stays bounded whatever the result size.
+
+        Args:
+            puuid: Only matches this player took part in
+            start_time: Only games created at or after this epoch time (milliseconds)
+            end_time: Only games created before this epoch time (milliseconds)
+            queue_id: Queue ID (e.g., 420)
+            patch: Patch (e.g., "14.24")
+        """
+        conditions = ["m.rowid > ?"]
+        params: List[Any] = []
+        if puuid:
+            conditions.append("m.match_id IN (SELECT match_id FROM match_participants WHERE puuid = ?)")
+            params.append(puuid)
+        if start_time is not None:
+            conditions.append("m.game_creation >= ?")
+            params.append(start_time)
+        if end_time is not None:
+            conditions.append("m.game_creation < ?")
+            params.append(end_time)
+        if queue_id is not None:
+            conditions.append("m.queue_id = ?")
+            params.append(queue_id)
+        if patch:
+            conditions.append("m.game_version LIKE ?")
+            params.append(f"{patch}.%")
+
+        query = f"SELECT m.rowid, m.data FROM matches m WHERE {' AND '.join(conditions)} ORDER BY m.rowid LIMIT ?"
+        last_rowid = 0
+        while True:
+            with self._lock:
+                rows = self._connection.execute(query, [last_rowid, *params, batch_size]).fetchall()
+            if not rows:
+                return
+            for rowid, data in rows:
+                last_rowid = rowid
+                yield json.loads(data)
+
+    def iter_riot_ids(self, batch_size: int = 5000) -> Iterator[Tuple[str, str, str, int]]:
+        """
+        Yields the (puuid, game name, tag line, game creation) of every stored participant
+
+        Rows come in storage order, not game order: the game creation time tells
+        which Riot ID of a player is the most recent.
+        """
+        last_rowid = 0
+        while True:
+            with self._lock:
+                rows = self._connection.execute(
+                    "SELECT rowid, puuid, riot_id_game_name, riot_id_tagline, game_creation FROM match_participants "
+                    "WHERE rowid > ? AND riot_id_game_name IS NOT NULL ORDER BY rowid LIMIT ?",
+                    (last_rowid, batch_size),
+                ).fetchall()
+            if not rows:
+                return
+            for rowid, puuid, game_name, tag_line, game_creation in rows:
+                last_rowid = rowid
+                yield puuid, game_name, tag_line, game_creation
+
+    def last_rowid(self) -> int:
+        """Returns the row ID of the most recently stored match (0 if empty)"""
+        with self._lock:
+            return self._connection.execute("SELECT COALESCE(MAX(rowid), 0) FROM matches").fetchone()[0]
+
+    def count(self) -> int:
+        """Returns the number of stored matches"""
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM matches").fetchone()[0]
+
+    def close(self) -> None:
+        """Closes the database connection"""
+        with self._lock:
+            self._connection.close()
@@ -0,0 +1,212 @@
+"""
+Match timeline processing
+Parses match-v5 timelines incrementally and reduces them to compact derived series
+"""
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+import codecs
+import json
+
+
+# Events kept in the summary, with the fields copied for each of them
+SUMMARY_EVENTS = {
+    "CHAMPION_KILL": ("killerId", "victimId", "assistingParticipantIds", "position"),
+    "ELITE_MONSTER_KILL": ("killerId", "killerTeamId", "monsterType", "monsterSubType", "position"),
+    "BUILDING_KILL": ("killerId", "teamId", "buildingType", "towerType", "laneType", "position"),
+}
+
+
+class IncrementalJsonReader:
+    """
+    Reads selected values out of a JSON document delivered in chunks
+
+    Only the part of the document currently being decoded is kept in memory,
+    so arrays of large objects can be consumed one element at a time.
+    """
+
+    def __init__(self, chunks: Iterable[bytes]):
+        self._chunks = iter(chunks)
+        self._text_decoder = codecs.getincrementaldecoder("utf-8")()
+        self._json_decoder = json.JSONDecoder()
+        self._buffer = ""
+        self._pos = 0
+
+    def _fill(self) -> bool:
+        """Appends the next chunk to the buffer, dropping consumed text. False at end of input"""
+        for chunk in self._chunks:
+            if not chunk:
+                continue
+            self._buffer = self._buffer[self._pos:] + self._text_decoder.decode(chunk)
+            self._pos = 0
+            return True
+        return False
+
+    def _skip_whitespace(self) -> None:
+        while True:
+            while self._pos < len(self._buffer) and self._buffer[self._pos] in " \t\r\n":
+                self._pos += 1
+            if self._pos < len(self._buffer) or not self._fill():
+                return
+
+    def _next_char(self) -> str:
+        self._skip_whitespace()
+        if self._pos >= len(self._buffer):
+            raise ValueError("Unexpected end of JSON document")
+        return self._buffer[self._pos]
+
+    def seek_key(self, *keys: str) -> Optional[str]:
+        """
+        Moves past the next occurrence of "key": for any of the keys and returns that key,
+        or None if none of them appears
+        """
+        tokens = {key: f'"{key}"' for key in keys}
+        longest = max(len(token) for token in tokens.values())
+        while True:
+            found = []
+            for key, token in tokens.items():
+                index = self._buffer.find(token, self._pos)
+                if index != -1:
+                    found.append((index, key))
+            if found:
+                index, key = min(found)
+                self._pos = index + len(tokens[key])
+                if self._next_char() != ":":
+                    continue
+                self._pos += 1
+                return key
+            # Keep a tail in case a token is split across two chunks
+            self._pos = max(self._pos, len(self._buffer) - longest)
+            if not self._fill():
+                return None
+
+    def read_value(self) -> Any:
+        """
+        Decodes the object or array starting at the current position
+        """
+        self._next_char()
+        while True:
+            try:
+                value, end = self._json_decoder.raw_decode(self._buffer, self._pos)
+                self._pos = end
+                return value
+            except json.JSONDecodeError:
+                if not self._fill():
+                    raise
+
+    def iter_array(self) -> Iterator[Any]:
+        """
+        Yields the elements of the array starting at the current position one by one
+        """
+        if self._next_char() != "[":
+            raise ValueError("Expected a JSON array")
+        self._pos += 1
+
+        while True:
+            char = self._next_char()
+            if char == "]":
+                self._pos += 1
+                return
+            if char == ",":
+                self._pos += 1
+                continue
+            yield self.read_value()
+
+
+def _new_participant(participant_id: int, participant_count: int) -> Dict[str, Any]:
+    return {
+        "participantId": participant_id,
+        "puuid": None,
+        # The first half of the participants plays on the blue side (100), the rest on the red side (200)
+        "teamId": 100 if participant_id <= participant_count // 2 else 200,
+        "gold": [],
+        "xp": [],
+        "cs": [],
+    }
+
+
+def summarize_timeline(chunks: Iterable[bytes]) -> Dict[str, Any]:
+    """
+    Reduces a raw match-v5 timeline to per-minute series and key events
+
+    "metadata" and the "frames" array are read in whichever order they appear,
+    frames being consumed one at a time in both cases.
+
+    Args:
+        chunks: Raw timeline document, as an iterable of byte chunks
+
+    Returns:
+        Dict: Team gold/XP differences, per-participant gold/XP/CS per minute,
+        and the list of kills, objectives and buildings
+    """
+    reader = IncrementalJsonReader(chunks)
+
+    metadata: Optional[Dict[str, Any]] = None
+    key = reader.seek_key("metadata", "frames")
+    if key == "metadata":
+        metadata = reader.read_value()
+        key = reader.seek_key("frames")
+    if key is None:
+        raise ValueError("Timeline frames not found")
+
+    known_count = len(metadata.get("participants", [])) if metadata is not None else 0
+    participants: Dict[int, Dict[str, Any]] = {
+        participant_id: _new_participant(participant_id, known_count)
+        for participant_id in range(1, known_count + 1)
+    }
+    minutes: List[int] = []
+    team_gold_diff: List[int] = []
+    team_xp_diff: List[int] = []
+    events: List[Dict[str, Any]] = []
+
+    for frame in reader.iter_array():
+        minutes.append(round(frame.get("timestamp", 0) / 60000))
+        gold_diff = 0
+        xp_diff = 0
+
+        participant_frames = frame.get("participantFrames", {})
+        participant_count = known_count or len(participant_frames)
+        for participant_id, stats in participant_frames.items():
+            participant_id = int(participant_id)
+            participant = participants.get(participant_id)
+            if participant is None:
+                if known_count:
+                    continue
+                participant = participants[participant_id] = _new_participant(participant_id, participant_count)
+            gold = stats.get("totalGold", 0)
+            xp = stats.get("xp", 0)
+            participant["gold"].append(gold)
+            participant["xp"].append(xp)
+            participant["cs"].append(stats.get("minionsKilled", 0) + stats.get("jungleMinionsKilled", 0))
+
+            sign = 1 if participant["teamId"] == 100 else -1
+            gold_diff += sign * gold
+            xp_diff += sign * xp
+
+        team_gold_diff.append(gold_diff)
+        team_xp_diff.append(xp_diff)
+
+        for event in frame.get("events", []):
+            fields = SUMMARY_EVENTS.get(event.get("type"))
+            if fields is None:
+                continue
+            summary = {"type": event["type"], "timestamp": event.get("timestamp")}
+            summary.update({field: event[field] for field in fields if field in event})
+            events.append(summary)
+
+    if metadata is None:
+        # Metadata placed after the frames
+        if not reader.seek_key("metadata"):
+            raise ValueError("Timeline metadata not found")
+        metadata = reader.read_value()
+
+    puuids: List[str] = metadata.get("participants", [])
+    for participant_id, puuid in enumerate(puuids, start=1):
+        participants.setdefault(participant_id, _new_participant(participant_id, len(puuids)))["puuid"] = puuid
+
+    return {
+        "matchId": metadata.get("matchId"),
+        "minutes": minutes,
+        "teamGoldDiff": team_gold_diff,
+        "teamXpDiff": team_xp_diff,
+        "participants": [participants[participant_id] for participant_id in sorted(participants)],
+        "events": events,
+    }
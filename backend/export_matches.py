@@ -0,0 +1,54 @@
+"""
+Command line export of stored matches
+
+Examples:
+    python export_matches.py --format ndjson > matches.ndjson
+    python export_matches.py --format parquet --level participant --queue 420 --patch 14.24 -o ranked.parquet
+"""
+import argparse
+import os
+import sys
+from dotenv import load_dotenv
+
+from app.export import iter_ndjson, iter_parquet, iter_participant_rows, parquet_available
+from app.storage import MatchStore
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Export stored matches as NDJSON or Parquet")
+    parser.add_argument("--format", choices=["ndjson", "parquet"], default="ndjson")
+    parser.add_argument("--level", choices=["match", "participant"], default="match",
+                        help="match (raw documents) or participant (one flat row per player)")
+    parser.add_argument("--puuid", help="Only matches this player took part in")
+    parser.add_argument("--start-time", type=int, help="Only games created at or after this epoch time (ms)")
+    parser.add_argument("--end-time", type=int, help="Only games created before this epoch time (ms)")
+    parser.add_argument("--queue", type=int, help="Queue ID (e.g., 420 for ranked solo)")
+    parser.add_argument("--patch", help="Patch (e.g., 14.24)")
+    parser.add_argument("-o", "--output", help="Output file (defaults to stdout)")
+    args = parser.parse_args()
+
+    if args.format == "parquet" and args.level != "participant":
+        parser.error("Parquet export is only available with --level participant")
+    if args.format == "parquet" and not parquet_available():
+        parser.error("Parquet export requires pyarrow (pip install pyarrow)")
+
+    load_dotenv()
+    store = MatchStore(os.getenv("MATCH_DB_PATH", "data/matches.db"))
+
+    matches = store.iter_filtered(args.puuid, args.start_time, args.end_time, args.queue, args.patch)
+    records = iter_participant_rows(matches) if args.level == "participant" else matches
+    chunks = iter_parquet(records) if args.format == "parquet" else iter_ndjson(records)
+
+    output = open(args.output, "wb") if args.output else sys.stdout.buffer
+    try:
+        for chunk in chunks:
+            output.write(chunk)
+    finally:
+        if args.output:
+            output.close()
+        store.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,17 +1,109 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app import routes
+from app.api import RiotApiClient
+from app.services import PlayerService, MatchService, LadderService, AnalyticsService, PrefetchPolicy
+from app.ladder import LadderIndex
+from app.storage import MatchStore
+from app.analytics import ChampionStats
+from app.admission import AdmissionController
+from app.quota import ConsumerQuota
+import asyncio
+import logging
 import os
 from dotenv import load_dotenv
 
 
-# Load environment variables from .env file
-load_dotenv()
+logger = logging.getLogger(__name__)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Creates the shared Riot API client and services, and releases them on shutdown"""
+    # Load environment variables from .env file
+    load_dotenv()
+    
+    riot_client = RiotApiClient()
+    ladder_index = LadderIndex()
+    match_store = MatchStore(os.getenv("MATCH_DB_PATH", "data/matches.db"))
+    champion_stats = ChampionStats()
+    analytics_service = AnalyticsService(champion_stats, match_store)
+    match_service = MatchService(riot_client, PrefetchPolicy.from_env(), match_store, champion_stats)
+    player_service = PlayerService(riot_client, match_service, ladder_index)
+    ladder_regions = [region.strip().upper() for region in os.getenv("LADDER_REGIONS", "").split(",") if region.strip()]
+    for region in ladder_regions:
+        if region not in riot_client.platform_endpoints:
+            logger.warning(f"Skipping ladder ingestion of unsupported region: {region}")
+    ladder_service = LadderService(
+        riot_client,
+        ladder_index,
+        regions=[region for region in ladder_regions if region in riot_client.platform_endpoints],
+        max_pages=int(os.getenv("LADDER_MAX_PAGES", "0")),
+        min_headroom=int(os.getenv("LADDER_MIN_HEADROOM", "20"))
+    )
+    
+    app.state.riot_client = riot_client
+    app.state.match_service = match_service
+    app.state.player_service = player_service
+    app.state.ladder_service = ladder_service
+    app.state.analytics_service = analytics_service
+    consumer_quota = ConsumerQuota(
+        budget=riot_client.rate_limit_max_requests,
+        window=riot_client.rate_limit_window,
+        max_share=float(os.getenv("CONSUMER_MAX_SHARE", "0.5")),
+        weights=ConsumerQuota.parse_weights(os.getenv("CONSUMER_WEIGHTS", ""))
+    )
+    app.state.admission_controller = AdmissionController(
+        riot_client,
+        match_service,
+        max_wait=float(os.getenv("ADMISSION_MAX_WAIT", "5")),
+        consumer_quota=consumer_quota
+    )
+    
+    cache_snapshot_path = os.getenv("CACHE_SNAPSHOT_PATH", "data/cache.snapshot")
+    snapshot_task = None
+    if cache_snapshot_path:
+        await riot_client.restore_caches(cache_snapshot_path)
+        snapshot_interval = float(os.getenv("CACHE_SNAPSHOT_INTERVAL", "300"))
+        if snapshot_interval > 0:
+            snapshot_task = asyncio.create_task(
+                riot_client.save_caches_periodically(cache_snapshot_path, snapshot_interval)
+            )
+    
+    warmup_regions = os.getenv("RIOT_WARMUP_REGIONS", "EUW")
+    await riot_client.warm_up([region.strip().upper() for region in warmup_regions.split(",") if region.strip()])
+    
+    rebuild_task = asyncio.create_task(asyncio.to_thread(analytics_service.rebuild))
+    riot_id_task = asyncio.create_task(
+        asyncio.to_thread(riot_client.riot_id_index.load, match_store.iter_riot_ids())
+    )
+    
+    ladder_task = None
+    if ladder_service.regions:
+        ladder_task = asyncio.create_task(
+            ladder_service.run_periodically(float(os.getenv("LADDER_REFRESH_INTERVAL", str(6 * 3600))))
+        )
+    
+    yield
+    
+    if ladder_task is not None:
+        ladder_task.cancel()
+    if snapshot_task is not None:
+        snapshot_task.cancel()
+    await match_service.cancel_prefetches()
+    if cache_snapshot_path:
+        await riot_client.save_caches(cache_snapshot_path)
+    await riot_client.close()
+    await asyncio.gather(rebuild_task, riot_id_task, return_exceptions=True)
+    match_store.close()
+
 
 app = FastAPI(
     title="League of Legends Stats API",
     description="A robust API for retrieving League of Legends player statistics",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # Configure CORS
@@ -33,4 +125,4 @@ app.include_router(routes.router)
 
 @app.get("/")
 async def root():
-    return {"message": "Welcome to the League of Legends Stats API!"}
\ No newline at end of file
+    return {"message": "Welcome to the League of Legends Stats API!"}